@@ -14,6 +14,12 @@ sys.stdout = (
 )  # allow printing of pytest output when running pytest-xdist https://stackoverflow.com/questions/27006884/pytest-xdist-without-capturing-output
 
 
+# Fixtures that load and analyze a whole recording are session scoped, so when running in parallel with pytest-xdist (`-n auto --dist loadgroup`) every test using the same recording is sent to the same worker and the recording is only processed once
+_RECORDING_FIXTURE_PREFIXES = ("new_A", "MA20", "maiden_voyage_data", "noisy_data_", "raw_generic_well_")
+# the groups are keyed by the dataset rather than by the fixture name, so fixtures that load the same file as another recording fixture are mapped onto that fixture's group
+_RECORDING_FIXTURES_SHARING_A_DATASET = {"raw_generic_well_a1": "new_A1", "raw_generic_well_a2": "new_A2"}
+
+
 def pytest_addoption(parser: Parser) -> None:
     parser.addoption(
         "--full-ci",
@@ -43,3 +49,16 @@ def pytest_collection_modifyitems(config: Config, items: List[Function]) -> None
         for item in items:
             if "slow" in item.keywords:
                 item.add_marker(skip_slow)
+
+    for item in items:
+        candidate_names = list(item.fixturenames)
+        if hasattr(item, "callspec"):
+            # tests parametrized over several recordings request them by name with `request.getfixturevalue`
+            candidate_names.extend(param for param in item.callspec.params.values() if isinstance(param, str))
+        dataset_group_names = [
+            _RECORDING_FIXTURES_SHARING_A_DATASET.get(name, name)
+            for name in candidate_names
+            if name.startswith(_RECORDING_FIXTURE_PREFIXES)
+        ]
+        if dataset_group_names:
+            item.add_marker(pytest.mark.xdist_group(name=dataset_group_names[0]))
@@ -20,7 +20,11 @@ extensions = [
     Extension(
         "mantarray_waveform_analysis.compression_cy",
         [os.path.join("src", "mantarray_waveform_analysis", "compression_cy") + ext],
-    )
+    ),
+    Extension(
+        "mantarray_waveform_analysis.peak_detection_cy",
+        [os.path.join("src", "mantarray_waveform_analysis", "peak_detection_cy") + ext],
+    ),
 ]
 
 if USE_CYTHON:
@@ -38,8 +38,10 @@ from .exceptions import TooFewPeaksDetectedError
 from .exceptions import TwoPeaksInARowError
 from .exceptions import TwoValleysInARowError
 from .exceptions import UnrecognizedFilterUuidError
+from .peak_detection import find_twitch_index_arrays
 from .peak_detection import find_twitch_indices
 from .peak_detection import peak_detector
+from .peak_detection import TwitchIndices
 from .pipelines import Pipeline
 from .pipelines import PipelineTemplate
 from .transforms import apply_empty_plate_calibration
@@ -96,6 +98,8 @@ __all__ = [
     "Pipeline",
     "peak_detector",
     "find_twitch_indices",
+    "find_twitch_index_arrays",
+    "TwitchIndices",
     "TooFewPeaksDetectedError",
     "MIN_NUMBER_PEAKS",
     "MIN_NUMBER_VALLEYS",
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 """Detecting peak and valleys of incoming Mantarray data."""
 
-from functools import partial
 from typing import Any
 from typing import Dict
 from typing import List
@@ -10,6 +9,7 @@ from typing import Tuple
 from typing import Union
 from uuid import UUID
 
+import attr
 from nptyping import Float64
 from nptyping import NDArray
 import numpy as np
@@ -37,10 +37,100 @@ from .exceptions import TooFewPeaksDetectedError
 from .exceptions import TwoPeaksInARowError
 from .exceptions import TwoValleysInARowError
 
+if 6 < 9:  # pragma: no cover # protect this from zimports deleting the pylint disable statement
+    from .peak_detection_cy import (  # pylint: disable=import-error # unsure why pylint is unable to recognize cython import...
+        find_back_to_back_features,
+        twitch_areas_under_curve,
+    )
+
 
 TWITCH_WIDTH_PERCENTS = range(10, 95, 5)
 TWITCH_WIDTH_INDEX_OF_CONTRACTION_VELOCITY_START = TWITCH_WIDTH_PERCENTS.index(10)
 TWITCH_WIDTH_INDEX_OF_CONTRACTION_VELOCITY_END = TWITCH_WIDTH_PERCENTS.index(90)
+_TWITCH_WIDTH_FRACTIONS = np.array(TWITCH_WIDTH_PERCENTS, dtype=np.float64) / 100
+
+
+@attr.s(eq=False)
+class TwitchIndices:
+    """Indices of the twitches that can be analyzed, stored as parallel arrays.
+
+    Element ``i`` of every array describes the same twitch.
+
+    Args:
+        peak: the index of the peak of each twitch
+        prior_peak: the index of the peak before each twitch, or -1 if the twitch is preceded by no peak
+        prior_valley: the index of the valley before each twitch
+        subsequent_peak: the index of the peak after each twitch
+        subsequent_valley: the index of the valley after each twitch
+    """
+
+    peak: NDArray[int] = attr.ib()
+    prior_peak: NDArray[int] = attr.ib()
+    prior_valley: NDArray[int] = attr.ib()
+    subsequent_peak: NDArray[int] = attr.ib()
+    subsequent_valley: NDArray[int] = attr.ib()
+
+    @classmethod
+    def from_dict(cls, twitch_indices: Dict[int, Dict[UUID, Optional[int]]]) -> "TwitchIndices":
+        """Convert from the dictionary format returned by find_twitch_indices.
+
+        Args:
+            twitch_indices: a dictionary in which the key is an integer representing the time points of all the peaks of interest and the value is an inner dictionary with various UUIDs of prior/subsequent peaks and valleys and their index values.
+
+        Returns:
+            the same indices stored as parallel arrays
+        """
+        twitch_infos = twitch_indices.values()
+        return cls(
+            peak=np.array(list(twitch_indices.keys()), dtype=int),
+            prior_peak=np.array(
+                [
+                    -1 if info[PRIOR_PEAK_INDEX_UUID] is None else info[PRIOR_PEAK_INDEX_UUID]
+                    for info in twitch_infos
+                ],
+                dtype=int,
+            ),
+            prior_valley=np.array([info[PRIOR_VALLEY_INDEX_UUID] for info in twitch_infos], dtype=int),
+            subsequent_peak=np.array([info[SUBSEQUENT_PEAK_INDEX_UUID] for info in twitch_infos], dtype=int),
+            subsequent_valley=np.array(
+                [info[SUBSEQUENT_VALLEY_INDEX_UUID] for info in twitch_infos], dtype=int
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.peak)
+
+    def as_dict(self) -> Dict[int, Dict[UUID, Optional[int]]]:
+        """Convert to the dictionary format returned by find_twitch_indices.
+
+        Returns:
+            a dictionary in which the key is an integer representing the time points of all the peaks of interest and the value is an inner dictionary with various UUIDs of prior/subsequent peaks and valleys and their index values.
+        """
+        return {
+            self.peak[i]: {
+                PRIOR_PEAK_INDEX_UUID: None if self.prior_peak[i] < 0 else self.prior_peak[i],
+                PRIOR_VALLEY_INDEX_UUID: self.prior_valley[i],
+                SUBSEQUENT_PEAK_INDEX_UUID: self.subsequent_peak[i],
+                SUBSEQUENT_VALLEY_INDEX_UUID: self.subsequent_valley[i],
+            }
+            for i in range(len(self))
+        }
+
+
+def _as_twitch_indices(
+    twitch_indices: Union[TwitchIndices, Dict[int, Dict[UUID, Optional[int]]]]
+) -> TwitchIndices:
+    """Accept the dictionary format returned by find_twitch_indices wherever TwitchIndices is expected.
+
+    Args:
+        twitch_indices: the indices of the peaks of interest and of their prior/subsequent peaks and valleys, either as TwitchIndices or as the dictionary returned by find_twitch_indices
+
+    Returns:
+        the indices stored as parallel arrays
+    """
+    if isinstance(twitch_indices, TwitchIndices):
+        return twitch_indices
+    return TwitchIndices.from_dict(twitch_indices)
 
 
 def peak_detector(
@@ -58,12 +148,12 @@ def peak_detector(
     Returns:
         A tuple of the indices of the peaks and valleys
     """
+    # rows of a C-contiguous (2, N) array are contiguous views, so this only copies if the caller passed a transposed/Fortran-ordered array
+    filtered_magnetic_signal = np.ascontiguousarray(filtered_magnetic_signal)
     magnetic_signal: NDArray[int] = filtered_magnetic_signal[1, :]
-    peak_invertor_factor = 1
-    valley_invertor_factor = -1
-    if not twitches_point_up:
-        peak_invertor_factor *= -1
-        valley_invertor_factor *= -1
+    # invert the signal at most once, instead of multiplying by +1/-1 which would copy the whole array for each call to find_peaks
+    peak_signal = magnetic_signal if twitches_point_up else np.negative(magnetic_signal)
+    valley_signal = np.negative(peak_signal)
     sampling_period_cms = filtered_magnetic_signal[0, 1] - filtered_magnetic_signal[0, 0]
     maximum_possible_twitch_frequency = 7  # pylint:disable=invalid-name # (Eli 9/1/20): I can't think of a shorter name to describe this concept fully # Hz
     minimum_required_samples_between_twitches = int(  # pylint:disable=invalid-name # (Eli 9/1/20): I can't think of a shorter name to describe this concept fully
@@ -74,49 +164,61 @@ def peak_detector(
     )
 
     # find required height of peaks
-    max_height = np.max(magnetic_signal)
-    min_height = np.min(magnetic_signal)
-    max_prominence = abs(max_height - min_height)
+    max_prominence = np.ptp(magnetic_signal)
     # find peaks and valleys
     peak_indices, _ = signal.find_peaks(
-        magnetic_signal * peak_invertor_factor,
+        peak_signal,
         width=minimum_required_samples_between_twitches / 2,
         distance=minimum_required_samples_between_twitches,
         prominence=max_prominence / 4,
     )
     valley_indices, properties = signal.find_peaks(
-        magnetic_signal * valley_invertor_factor,
+        valley_signal,
         width=minimum_required_samples_between_twitches / 2,
         distance=minimum_required_samples_between_twitches,
         prominence=max_prominence / 4,
     )
-    left_ips = properties["left_ips"]
-    right_ips = properties["right_ips"]
-
-    # TODO Tanner (11/3/20): move this loop to find_twitch_indices
-    # Patches error in B6 file for when two valleys are found in a single valley. If this is true left_bases, right_bases, prominences, and raw magnetic sensor data will also be equivalent to their previous value. This if statement indicates that the valley should be disregarded if the interpolated values on left and right intersection points of a horizontal line at the an evaluation height are equivalent. This would mean that the left and right sides of the peak and its neighbor peak align, indicating that it just one peak rather than two.
-    # https://docs.scipy.org/doc/scipy/reference/generated/scipy.signal.peak_widths.html#scipy.signal.peak_widths
-
-    i = 1
-    while i < len(valley_indices):
-        if left_ips[i] == left_ips[i - 1] and right_ips[i] == right_ips[i - 1]:
-            valley_idx = valley_indices[i]
-            valley_idx_last = valley_indices[i - 1]
-
-            if magnetic_signal[valley_idx_last] >= magnetic_signal[valley_idx]:
-                valley_indices = np.delete(valley_indices, i)
-                left_ips = np.delete(left_ips, i)
-                right_ips = np.delete(right_ips, i)
-            else:  # pragma: no cover # (Anna 3/31/21): we don't have a case as of yet in which the first peak is higher than the second however know that it is possible and therefore aren't worried about code coverage in this case.
-                valley_indices = np.delete(valley_indices, i - 1)  # pragma: no cover
-                left_ips = np.delete(left_ips, i - 1)  # pragma: no cover
-                right_ips = np.delete(right_ips, i - 1)  # pragma: no cover
-        else:
-            i += 1
+    # TODO Tanner (11/3/20): move this to find_twitch_indices
+    valley_indices = _remove_duplicate_valleys(
+        valley_indices, properties["left_ips"], properties["right_ips"], magnetic_signal
+    )
 
     return peak_indices, valley_indices
 
 
+def _remove_duplicate_valleys(
+    valley_indices: NDArray[int],
+    left_ips: NDArray[float],
+    right_ips: NDArray[float],
+    magnetic_signal: NDArray[int],
+) -> NDArray[int]:
+    """Keep only one valley of each set of valleys that are really the same valley.
+
+    Patches error in B6 file for when two valleys are found in a single valley. If this is true left_bases, right_bases, prominences, and raw magnetic sensor data will also be equivalent to their previous value. A valley should be disregarded if the interpolated values on left and right intersection points of a horizontal line at the an evaluation height are equivalent to those of its neighbor. This would mean that the left and right sides of the valley and its neighbor valley align, indicating that it just one valley rather than two.
+    https://docs.scipy.org/doc/scipy/reference/generated/scipy.signal.peak_widths.html#scipy.signal.peak_widths
+
+    Args:
+        valley_indices: a 1D array of the indices of the valleys
+        left_ips: the interpolated left intersection point of each valley, as returned by scipy.signal.find_peaks
+        right_ips: the interpolated right intersection point of each valley, as returned by scipy.signal.find_peaks
+        magnetic_signal: a 1D array of the magnetic signal the valleys were found in
+
+    Returns:
+        the valley indices with the duplicates removed. Of each set of consecutive duplicates, the valley with the highest signal is kept (the first one if there is a tie)
+    """
+    starts_new_valley = np.ones(len(valley_indices), dtype=bool)
+    starts_new_valley[1:] = np.logical_or(left_ips[1:] != left_ips[:-1], right_ips[1:] != right_ips[:-1])
+    valley_group_ids = np.cumsum(starts_new_valley) - 1
+    valley_values = magnetic_signal[valley_indices]
+    highest_value_of_group = np.maximum.reduceat(valley_values, np.flatnonzero(starts_new_valley))
+    candidate_positions = np.flatnonzero(valley_values == highest_value_of_group[valley_group_ids])
+    _, first_candidate_of_each_group = np.unique(valley_group_ids[candidate_positions], return_index=True)
+    deduplicated_valley_indices: NDArray[int] = valley_indices[
+        candidate_positions[first_candidate_of_each_group]
+    ]
+    return deduplicated_valley_indices
+
+
 def create_avg_dict(metric: NDArray[int], round_to_int: bool = True) -> Dict[str, Union[Float64, int]]:
     """Calculate the average values of a specific metric.
 
@@ -127,12 +229,15 @@ def create_avg_dict(metric: NDArray[int], round_to_int: bool = True) -> Dict[str
         a dictionary of the average statistics of that metric in which the metrics are the key and average statistics are the value
     """
     dictionary: Dict[str, Union[Float64, int]] = dict()
+    metric = np.asarray(metric)
     dictionary["n"] = len(metric)
     if len(metric) > 0:
-        dictionary["mean"] = np.mean(metric)
-        dictionary["std"] = np.std(metric)
-        dictionary["min"] = np.min(metric)
-        dictionary["max"] = np.max(metric)
+        # compute the mean once and reuse it for the standard deviation rather than letting np.std recompute it
+        mean = metric.sum(dtype=np.float64) / len(metric)
+        dictionary["mean"] = mean
+        dictionary["std"] = np.sqrt(np.square(metric - mean).sum() / len(metric))
+        dictionary["min"] = metric.min()
+        dictionary["max"] = metric.max()
     else:
         dictionary["mean"] = None
         dictionary["std"] = None
@@ -155,7 +260,10 @@ def data_metrics(
         Dict[
             UUID,  # pylint: disable=duplicate-code # Anna (1/7/21): long type definition causing failture
             Union[
-                Dict[int, Dict[UUID, Union[Tuple[int, int], int]]],
+                Dict[  # pylint: disable=duplicate-code # Anna (1/7/21): long type definition causing failture
+                    int,
+                    Dict[UUID, Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]]],
+                ],
                 Union[float, int],
             ],
         ],  # pylint: disable=duplicate-code # Anna (1/7/21): long type definition causing failture
@@ -180,7 +288,13 @@ def data_metrics(
         int,
         Dict[
             UUID,
-            Union[Dict[int, Dict[UUID, Union[Tuple[int, int], int]]], Union[float, int]],
+            Union[
+                Dict[  # pylint: disable=duplicate-code # Anna (1/7/21): long type definition causing failture
+                    int,
+                    Dict[UUID, Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]]],
+                ],
+                Union[float, int],
+            ],
         ],
     ] = dict()
     aggregate_dict: Dict[
@@ -194,17 +308,19 @@ def data_metrics(
     auc_averages_dict: Dict[str, Union[float, int]] = {}
 
     peak_indices, _ = peak_and_valley_indices
+    # make the layout contiguous once up front so that every metric below reads its time/value rows sequentially
+    filtered_data = np.ascontiguousarray(filtered_data)
 
     # find twitch time points
 
-    twitch_indices = find_twitch_indices(peak_and_valley_indices)
+    twitch_indices = find_twitch_index_arrays(peak_and_valley_indices)
     num_twitches = len(twitch_indices)
     time_series = filtered_data[0, :]
 
     # find twitch periods
     combined_twitch_periods = calculate_twitch_period(twitch_indices, peak_indices, filtered_data)
 
-    twitch_frequencies = 1 / (combined_twitch_periods.astype(float) / CENTIMILLISECONDS_PER_SECOND)
+    twitch_frequencies = 1 / (combined_twitch_periods.astype(np.float64) / CENTIMILLISECONDS_PER_SECOND)
     frequency_averages_dict = create_avg_dict(twitch_frequencies, round_to_int=False)
 
     # find aggregate values of period data
@@ -222,20 +338,14 @@ def data_metrics(
     aggregate_dict[AMPLITUDE_UUID] = amplitude_averages_dict
 
     # find twitch widths
-    widths = calculate_twitch_widths(twitch_indices, filtered_data, round_to_int=rounded)
-    width_stats_dict: Dict[int, Dict[str, Union[float, int]]] = dict()
-
-    for iter_percent in TWITCH_WIDTH_PERCENTS:
-        iter_list_of_width_values: List[Union[float, int]] = []
-        for iter_twitch in widths:
-            iter_width_value = iter_twitch[iter_percent][WIDTH_VALUE_UUID]
-            if not isinstance(iter_width_value, (float, int)):  # making mypy happy
-                raise NotImplementedError(
-                    f"The width value under key {WIDTH_VALUE_UUID} must be a float or an int. It was: {iter_width_value}"
-                )
-            iter_list_of_width_values.append(iter_width_value)
-        iter_stats_dict = create_avg_dict(iter_list_of_width_values, round_to_int=rounded)
-        width_stats_dict[iter_percent] = iter_stats_dict
+    width_coordinates = _find_twitch_width_coordinates(twitch_indices, filtered_data)
+    width_values = _calculate_width_values(width_coordinates, round_to_int=rounded)
+    widths = _pack_twitch_widths(width_values, width_coordinates, round_to_int=rounded)
+    # the columns of the width values are the width percents, so the stats of each percent come straight from a column
+    width_stats_dict: Dict[int, Dict[str, Union[float, int]]] = {
+        iter_percent: create_avg_dict(width_values[:, iter_percent_idx], round_to_int=rounded)
+        for iter_percent_idx, iter_percent in enumerate(TWITCH_WIDTH_PERCENTS)
+    }
 
     aggregate_dict[WIDTH_UUID] = width_stats_dict
 
@@ -266,62 +376,46 @@ def data_metrics(
     aggregate_dict[AUC_UUID] = auc_averages_dict
 
     # add metrics to per peak dictionary
-    twitch_peak_indices = tuple(twitch_indices.keys())
+    twitch_peak_times = time_series[twitch_indices.peak]
     for i in range(num_twitches):
-        main_twitch_dict.update(
-            {
-                time_series[twitch_peak_indices[i]]: {
-                    TWITCH_PERIOD_UUID: combined_twitch_periods[i],
-                    AMPLITUDE_UUID: amplitudes[i],
-                    WIDTH_UUID: widths[i],
-                    AUC_UUID: auc_per_twitch[i],
-                    TWITCH_FREQUENCY_UUID: twitch_frequencies[i],
-                    CONTRACTION_VELOCITY_UUID: contraction_velocity[i],
-                    RELAXATION_VELOCITY_UUID: relaxation_velocity[i],
-                    IRREGULARITY_INTERVAL_UUID: interval_irregularity[i],
-                }
-            }
-        )
+        main_twitch_dict[twitch_peak_times[i]] = {
+            TWITCH_PERIOD_UUID: combined_twitch_periods[i],
+            AMPLITUDE_UUID: amplitudes[i],
+            WIDTH_UUID: widths[i],
+            AUC_UUID: auc_per_twitch[i],
+            TWITCH_FREQUENCY_UUID: twitch_frequencies[i],
+            CONTRACTION_VELOCITY_UUID: contraction_velocity[i],
+            RELAXATION_VELOCITY_UUID: relaxation_velocity[i],
+            IRREGULARITY_INTERVAL_UUID: interval_irregularity[i],
+        }
 
     return main_twitch_dict, aggregate_dict
 
 
 def calculate_interval_irregularity(
-    twitch_indices: NDArray[int],
+    twitch_indices: Union[TwitchIndices, Dict[int, Dict[UUID, Optional[int]]]],
     time_series: NDArray[(1, Any), int],
 ) -> NDArray[float]:
     """Find the interval irregularity for each twitch.
 
     Args:
-        twitch_indices: a dictionary in which the key is an integer representing the time points of all the peaks of interest and the value is an inner dictionary with various UUID of prior/subsequent peaks and valleys and their index values.
+        twitch_indices: the indices of the peaks of interest and of their prior/subsequent peaks and valleys, either as TwitchIndices or as the dictionary returned by find_twitch_indices
         filtered_data: a 2D array (time vs value) of the data
 
     Returns:
         an array of floats that are the interval irregularities of each twitch
     """
-    list_of_twitch_indices = list(twitch_indices.keys())
-    num_twitches = len(list_of_twitch_indices)
-
-    iter_list_of_intervals: List[Union[float, int, None]] = []
-    iter_list_of_intervals.append(None)
-
-    for twitch in range(1, num_twitches - 1):
-        last_twitch_index = list_of_twitch_indices[twitch - 1]
-        current_twitch_index = list_of_twitch_indices[twitch]
-        next_twitch_index = list_of_twitch_indices[twitch + 1]
-
-        last_interval = time_series[current_twitch_index] - time_series[last_twitch_index]
-        current_interval = time_series[next_twitch_index] - time_series[current_twitch_index]
-        interval = abs(current_interval - last_interval)
-
-        iter_list_of_intervals.append(interval)
-
-    iter_list_of_intervals.append(None)
-    return np.asarray(iter_list_of_intervals, dtype=float)
+    twitch_indices = _as_twitch_indices(twitch_indices)
+    num_twitches = len(twitch_indices)
+    # the first and last twitch are missing the interval on one side, so they have no irregularity
+    interval_irregularities = np.full(num_twitches, np.nan)
+    intervals = np.diff(time_series[twitch_indices.peak])
+    interval_irregularities[1:-1] = np.abs(np.diff(intervals))
+    return interval_irregularities
 
 
 def calculate_twitch_velocity(
-    twitch_indices: NDArray[int],
+    twitch_indices: Union[TwitchIndices, Dict[int, Dict[UUID, Optional[int]]]],
     widths: List[
         Dict[
             int,
@@ -336,15 +430,15 @@ def calculate_twitch_velocity(
     """Find the velocity for each twitch.
 
     Args:
-        twitch_indices: a dictionary in which the key is an integer representing the time points of all the peaks of interest and the value is an inner dictionary with various UUID of prior/subsequent peaks and valleys and their index values.
+        twitch_indices: the indices of the peaks of interest and of their prior/subsequent peaks and valleys, either as TwitchIndices or as the dictionary returned by find_twitch_indices
         widths: a list of dictionaries where the first key is the percentage of the way down to the nearby valleys, the second key is a UUID representing either the value of the width, or the rising or falling coordinates. The final value is either an int (for value) or a tuple of ints for the x/y coordinates
         is_contraction: a boolean indicating if twitch velocities to be calculating are for the twitch contraction or relaxation
 
     Returns:
         an array of floats that are the velocities of each twitch
     """
-    list_of_twitch_indices = list(twitch_indices.keys())
-    num_twitches = len(list_of_twitch_indices)
+    twitch_indices = _as_twitch_indices(twitch_indices)
+    num_twitches = len(twitch_indices)
     coord_type = WIDTH_RISING_COORDS_UUID
     if not is_contraction:
         coord_type = WIDTH_FALLING_COORDS_UUID
@@ -352,7 +446,7 @@ def calculate_twitch_velocity(
     twitch_base = TWITCH_WIDTH_PERCENTS[TWITCH_WIDTH_INDEX_OF_CONTRACTION_VELOCITY_END]
     twitch_top = TWITCH_WIDTH_PERCENTS[TWITCH_WIDTH_INDEX_OF_CONTRACTION_VELOCITY_START]
 
-    iter_list_of_velocities: List[Union[float, int]] = []
+    velocities = np.empty(num_twitches, dtype=float)
     for twitch in range(num_twitches):
         iter_coord_base = widths[twitch][twitch_base][coord_type]
         iter_coord_top = widths[twitch][twitch_top][coord_type]
@@ -365,38 +459,38 @@ def calculate_twitch_velocity(
             raise NotImplementedError(
                 f"The width value under twitch {twitch} must be a Tuple. It was: {iter_coord_top}"
             )
-        velocity = abs((iter_coord_top[1] - iter_coord_base[1]) / (iter_coord_top[0] - iter_coord_base[0]))
-        iter_list_of_velocities.append(velocity)
-    return np.asarray(iter_list_of_velocities, dtype=float)
+        velocities[twitch] = abs(
+            (iter_coord_top[1] - iter_coord_base[1]) / (iter_coord_top[0] - iter_coord_base[0])
+        )
+    return velocities
 
 
 def calculate_twitch_period(
-    twitch_indices: NDArray[int],
+    twitch_indices: Union[TwitchIndices, Dict[int, Dict[UUID, Optional[int]]]],
     all_peak_indices: NDArray[int],
     filtered_data: NDArray[(2, Any), int],
 ) -> NDArray[int]:
     """Find the distance between each twitch at its peak.
 
     Args:
-        twitch_indices:a dictionary in which the key is an integer representing the time points of all the peaks of interest and the value is an inner dictionary with various UUID of prior/subsequent peaks and valleys and their index values.
+        twitch_indices: the indices of the peaks of interest and of their prior/subsequent peaks and valleys, either as TwitchIndices or as the dictionary returned by find_twitch_indices
         all_peak_indices: a 1D array of the indices in teh data array that all peaks are at
         filtered_data: a 2D array (time vs value) of the data
 
     Returns:
         an array of integers that are the period of each twitch
     """
-    list_of_twitch_indices = list(twitch_indices.keys())
-    idx_of_first_twitch = np.where(all_peak_indices == list_of_twitch_indices[0])[0][0]
-    period: List[int] = []
+    twitch_indices = _as_twitch_indices(twitch_indices)
+    # peak indices are sorted, so the first twitch can be found with a binary search
+    idx_of_first_twitch = int(np.searchsorted(all_peak_indices, twitch_indices.peak[0]))
     time_series = filtered_data[0, :]
-    for iter_twitch_idx in range(len(list_of_twitch_indices)):
-
-        period.append(
-            time_series[all_peak_indices[iter_twitch_idx + idx_of_first_twitch + 1]]
-            - time_series[all_peak_indices[iter_twitch_idx + idx_of_first_twitch]]
-        )
+    # each twitch's period runs from its own peak to the next peak, so one extra peak is needed
+    twitch_and_next_peak_indices = all_peak_indices[
+        idx_of_first_twitch : idx_of_first_twitch + len(twitch_indices) + 1
+    ]
+    period: NDArray[int] = np.diff(time_series[twitch_and_next_peak_indices]).astype(np.int32)
 
-    return np.asarray(period, dtype=np.int32)
+    return period
 
 
 def find_twitch_indices(
@@ -413,56 +507,55 @@ def find_twitch_indices(
     Returns:
         a dictionary in which the key is an integer representing the time points of all the peaks of interest and the value is an inner dictionary with various UUIDs of prior/subsequent peaks and valleys and their index values.
     """
+    return find_twitch_index_arrays(peak_and_valley_indices).as_dict()
+
+
+def find_twitch_index_arrays(
+    peak_and_valley_indices: Tuple[NDArray[int], NDArray[int]],
+) -> TwitchIndices:
+    """Find twitches that can be analyzed.
+
+    Same as find_twitch_indices, but the results are stored as parallel arrays instead of a dictionary so that metrics can index into the data for all twitches at once.
+
+    Args:
+        peak_and_valley_indices: a Tuple of 1D array of integers representing the indices of the peaks and valleys
+
+    Returns:
+        the indices of the peaks of interest and of their prior/subsequent peaks and valleys
+    """
     peak_indices, valley_indices = peak_and_valley_indices
 
     _too_few_peaks_or_valleys(peak_indices, valley_indices)
 
-    twitches: Dict[int, Dict[UUID, Optional[int]]] = {}
-
     starts_with_peak = peak_indices[0] < valley_indices[0]
-    prev_feature_is_peak = starts_with_peak
-    peak_idx, valley_idx = _find_start_indices(starts_with_peak)
-
-    # check for two back-to-back features
-    while peak_idx < len(peak_indices) and valley_idx < len(valley_indices):
-        if prev_feature_is_peak:
-            if valley_indices[valley_idx] > peak_indices[peak_idx]:
-                raise TwoPeaksInARowError(
-                    (peak_indices[peak_idx - 1], peak_indices[peak_idx]),
-                )
-            valley_idx += 1
-        else:
-            if valley_indices[valley_idx] < peak_indices[peak_idx]:
-                raise TwoValleysInARowError(
-                    (valley_indices[valley_idx - 1], valley_indices[valley_idx]),
-                )
-            peak_idx += 1
-        prev_feature_is_peak = not prev_feature_is_peak
-    if peak_idx < len(peak_indices) - 1:
+
+    # check for two back-to-back features. The compiled kernel walks the alternating peaks and valleys, and only the raising of the error is left to Python
+    repeated_peak_position, repeated_valley_position = find_back_to_back_features(
+        np.asarray(peak_indices, dtype=np.intp), np.asarray(valley_indices, dtype=np.intp), starts_with_peak
+    )
+    if repeated_peak_position >= 0:
         raise TwoPeaksInARowError(
-            (peak_indices[peak_idx], peak_indices[peak_idx + 1]),
+            (peak_indices[repeated_peak_position], peak_indices[repeated_peak_position + 1]),
         )
-    if valley_idx < len(valley_indices) - 1:
+    if repeated_valley_position >= 0:
         raise TwoValleysInARowError(
-            (valley_indices[valley_idx], valley_indices[valley_idx + 1]),
+            (valley_indices[repeated_valley_position], valley_indices[repeated_valley_position + 1]),
         )
 
-    # compile dict of twitch information
-    for itr_idx, itr_peak_index in enumerate(peak_indices):
-        if itr_idx < peak_indices.shape[0] - 1:  # last peak
-            if itr_idx == 0 and starts_with_peak:
-                continue
-
-            twitches[itr_peak_index] = {
-                PRIOR_PEAK_INDEX_UUID: None if itr_idx == 0 else peak_indices[itr_idx - 1],
-                PRIOR_VALLEY_INDEX_UUID: valley_indices[itr_idx - 1 if starts_with_peak else itr_idx],
-                SUBSEQUENT_PEAK_INDEX_UUID: peak_indices[itr_idx + 1],
-                SUBSEQUENT_VALLEY_INDEX_UUID: valley_indices[itr_idx if starts_with_peak else itr_idx + 1],
-            }
-
-    # print(list(twitches.keys())[0])
-    # print(twitches[list(twitches.keys())[0]])
-    return twitches
+    # the first peak can't be analyzed when there is no valley before it, and the last peak never can
+    twitch_positions = np.arange(1 if starts_with_peak else 0, len(peak_indices) - 1)
+    # valleys and peaks alternate, so a valley shares its position with the peak that follows it unless the data starts with a peak
+    prior_valley_positions = twitch_positions - 1 if starts_with_peak else twitch_positions
+    prior_peak_indices = peak_indices[twitch_positions - 1]
+    prior_peak_indices[twitch_positions == 0] = -1
+
+    return TwitchIndices(
+        peak=peak_indices[twitch_positions],
+        prior_peak=prior_peak_indices,
+        prior_valley=valley_indices[prior_valley_positions],
+        subsequent_peak=peak_indices[twitch_positions + 1],
+        subsequent_valley=valley_indices[prior_valley_positions + 1],
+    )
 
 
 def _too_few_peaks_or_valleys(peak_indices: NDArray[int], valley_indices: NDArray[int]) -> None:
@@ -482,99 +575,205 @@ def _too_few_peaks_or_valleys(peak_indices: NDArray[int], valley_indices: NDArra
         )
 
 
-def _find_start_indices(starts_with_peak: bool) -> Tuple[int, int]:
-    """Find start indices for peaks and valleys.
-
-    Args:
-        starts_with_peak: bool indicating whether or not a peak rather than a valley comes first
-
-    Returns:
-        peak_idx: peak start index
-        valley_idx: valley start index
-    """
-    peak_idx = 0
-    valley_idx = 0
-    if starts_with_peak:
-        peak_idx += 1
-    else:
-        valley_idx += 1
-
-    return peak_idx, valley_idx
-
-
 def calculate_amplitudes(
-    twitch_indices: Dict[int, Dict[UUID, Optional[int]]],
+    twitch_indices: Union[TwitchIndices, Dict[int, Dict[UUID, Optional[int]]]],
     filtered_data: NDArray[(2, Any), int],
     round_to_int: bool = True,
 ) -> NDArray[float]:
     """Get the amplitudes for all twitches.
 
     Args:
-        twitch_indices: a dictionary in which the key is an integer representing the time points of all the peaks of interest and the value is an inner dictionary with various UUID of prior/subsequent peaks and valleys and their index values.
+        twitch_indices: the indices of the peaks of interest and of their prior/subsequent peaks and valleys, either as TwitchIndices or as the dictionary returned by find_twitch_indices
         filtered_data: a 2D array of the time and value (magnetic, voltage, displacement, force...) data after it has gone through noise filtering
 
     Returns:
         a 1D array of integers representing the amplitude of each twitch
     """
-    amplitudes: List[int] = list()
+    twitch_indices = _as_twitch_indices(twitch_indices)
     amplitude_series = filtered_data[1, :]
-    for iter_twitch_peak_idx, iter_twitch_indices_info in twitch_indices.items():
-        peak_amplitude = amplitude_series[iter_twitch_peak_idx]
-        prior_amplitude = amplitude_series[iter_twitch_indices_info[PRIOR_VALLEY_INDEX_UUID]]
-        subsequent_amplitude = amplitude_series[iter_twitch_indices_info[SUBSEQUENT_VALLEY_INDEX_UUID]]
-        amplitude_value = ((peak_amplitude - prior_amplitude) + (peak_amplitude - subsequent_amplitude)) / 2
-        if round_to_int:
-            amplitude_value = int(round(amplitude_value, 0))
-
-        amplitudes.append(abs(amplitude_value))
+    peak_amplitudes = amplitude_series[twitch_indices.peak]
+    prior_amplitudes = amplitude_series[twitch_indices.prior_valley]
+    subsequent_amplitudes = amplitude_series[twitch_indices.subsequent_valley]
+    amplitudes = ((peak_amplitudes - prior_amplitudes) + (peak_amplitudes - subsequent_amplitudes)) / 2
+    if round_to_int:
+        amplitudes = np.round(amplitudes)
+    amplitudes = np.abs(amplitudes)
 
     return np.asarray(amplitudes, dtype=float)
 
 
-def interpolate_x_for_y_between_two_points(  # pylint:disable=invalid-name # (Eli 9/1/20: I can't think of a shorter name to describe this concept fully)
-    desired_y: Union[int, float],
+def interpolate_y_for_x_between_two_points(  # pylint:disable=invalid-name # (Eli 9/1/20: I can't think of a shorter name to describe this concept fully)
+    desired_x: Union[int, float],
     x_1: Union[int, float],
     y_1: Union[int, float],
     x_2: Union[int, float],
     y_2: Union[int, float],
 ) -> Union[int, float]:
-    """Find a value of x between two points that matches the desired y value.
+    """Find a value of y between two points that matches the desired x value.
 
     Uses linear interpolation, based on point-slope formula.
     """
     slope = (y_2 - y_1) / (x_2 - x_1)
-    return (desired_y - y_1) / slope + x_1
+    return slope * (desired_x - x_1) + y_1
 
 
-def interpolate_y_for_x_between_two_points(  # pylint:disable=invalid-name # (Eli 9/1/20: I can't think of a shorter name to describe this concept fully)
-    desired_x: Union[int, float],
-    x_1: Union[int, float],
-    y_1: Union[int, float],
-    x_2: Union[int, float],
-    y_2: Union[int, float],
-) -> Union[int, float]:
-    """Find a value of y between two points that matches the desired x value.
+def interpolate_x_for_y_between_two_points(  # pylint:disable=invalid-name # (Eli 9/1/20: I can't think of a shorter name to describe this concept fully)
+    desired_y: Union[int, float, NDArray[float]],
+    x_1: Union[int, float, NDArray[float]],
+    y_1: Union[int, float, NDArray[float]],
+    x_2: Union[int, float, NDArray[float]],
+    y_2: Union[int, float, NDArray[float]],
+) -> Union[int, float, NDArray[float]]:
+    """Find a value of x between two points that matches the desired y value.
 
-    Uses linear interpolation, based on point-slope formula.
+    Uses linear interpolation, based on point-slope formula. Also
+    operates elementwise on arrays of points.
     """
     slope = (y_2 - y_1) / (x_2 - x_1)
-    return slope * (desired_x - x_1) + y_1
+    return (desired_y - y_1) / slope + x_1
 
 
 def calculate_twitch_widths(
-    twitch_indices: Dict[int, Dict[UUID, Optional[int]]],
+    twitch_indices: Union[TwitchIndices, Dict[int, Dict[UUID, Optional[int]]]],
     filtered_data: NDArray[(2, Any), int],
     round_to_int: bool = True,
 ) -> List[Dict[int, Dict[UUID, Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]],],]]:
     """Determine twitch width between 10-90% down to the nearby valleys.
 
     Args:
-        twitch_indices: a dictionary in which the key is an integer representing the time points of all the peaks of interest and the value is an inner dictionary with various UUIDs of prior/subsequent peaks and valleys and their index values.
+        twitch_indices: the indices of the peaks of interest and of their prior/subsequent peaks and valleys, either as TwitchIndices or as the dictionary returned by find_twitch_indices
         filtered_data: a 2D array of the time and value (magnetic, voltage, displacement, force...) data after it has gone through noise filtering
 
     Returns:
         a list of dictionaries where the first key is the percentage of the way down to the nearby valleys, the second key is a UUID representing either the value of the width, or the rising or falling coordinates. The final value is either an int (for value) or a tuple of ints for the x/y coordinates
     """
+    twitch_indices = _as_twitch_indices(twitch_indices)
+    width_coordinates = _find_twitch_width_coordinates(twitch_indices, filtered_data)
+    width_values = _calculate_width_values(width_coordinates, round_to_int=round_to_int)
+    return _pack_twitch_widths(width_values, width_coordinates, round_to_int=round_to_int)
+
+
+def _find_twitch_width_coordinates(
+    twitch_indices: TwitchIndices,
+    filtered_data: NDArray[(2, Any), int],
+) -> Tuple[NDArray[float], NDArray[float], NDArray[float], NDArray[float]]:
+    """Locate the rising and falling coordinates of every twitch width.
+
+    Args:
+        twitch_indices: the indices of the peaks of interest and of their prior/subsequent peaks and valleys
+        filtered_data: a 2D array of the time and value (magnetic, voltage, displacement, force...) data after it has gone through noise filtering
+
+    Returns:
+        the rising timepoints, rising thresholds, falling timepoints and falling thresholds, each as a 2D array where the rows are the twitches and the columns are the width percents
+    """
+    value_series = filtered_data[1, :]
+    coordinates_shape = (len(twitch_indices), len(TWITCH_WIDTH_PERCENTS))
+    rising_timepoints = np.empty(coordinates_shape, dtype=np.float64)
+    rising_thresholds = np.empty(coordinates_shape, dtype=np.float64)
+    falling_timepoints = np.empty(coordinates_shape, dtype=np.float64)
+    falling_thresholds = np.empty(coordinates_shape, dtype=np.float64)
+    for iter_twitch_idx, (iter_twitch_peak_idx, prior_valley_idx, subsequent_valley_idx) in enumerate(
+        zip(twitch_indices.peak, twitch_indices.prior_valley, twitch_indices.subsequent_valley)
+    ):
+        peak_value = value_series[iter_twitch_peak_idx]
+        prior_valley_value = value_series[prior_valley_idx]
+        subsequent_valley_value = value_series[subsequent_valley_idx]
+
+        rising_amplitude = peak_value - prior_valley_value
+        falling_amplitude = peak_value - subsequent_valley_value
+
+        iter_rising_thresholds = peak_value - _TWITCH_WIDTH_FRACTIONS * rising_amplitude
+        iter_falling_thresholds = peak_value - _TWITCH_WIDTH_FRACTIONS * falling_amplitude
+
+        rising_timepoints[iter_twitch_idx] = _find_threshold_crossing_timepoints(
+            filtered_data, iter_twitch_peak_idx, prior_valley_idx, iter_rising_thresholds
+        )
+        falling_timepoints[iter_twitch_idx] = _find_threshold_crossing_timepoints(
+            filtered_data, iter_twitch_peak_idx, subsequent_valley_idx, iter_falling_thresholds
+        )
+        rising_thresholds[iter_twitch_idx] = iter_rising_thresholds
+        falling_thresholds[iter_twitch_idx] = iter_falling_thresholds
+    return rising_timepoints, rising_thresholds, falling_timepoints, falling_thresholds
+
+
+def _find_threshold_crossing_timepoints(
+    filtered_data: NDArray[(2, Any), int],
+    peak_idx: int,
+    valley_idx: int,
+    thresholds: NDArray[float],
+) -> NDArray[float]:
+    """Find when one side of a twitch crosses each of its width thresholds.
+
+    Args:
+        filtered_data: a 2D array of the time and value (magnetic, voltage, displacement, force...) data after it has gone through noise filtering
+        peak_idx: the index of the peak of the twitch
+        valley_idx: the index of the valley on the side of the twitch being searched. A valley before the peak selects the rising side and a valley after the peak selects the falling side
+        thresholds: the threshold value of each width percent
+
+    Returns:
+        a 1D array of the interpolated times at which each threshold is reached
+    """
+    value_series = filtered_data[1, :]
+    time_series = filtered_data[0, :]
+    valley_value = value_series[valley_idx]
+    threshold_distances = np.abs(thresholds - valley_value)
+    # the threshold is reached at the sample closest to the peak whose distance from the valley is within the threshold's distance from the valley. Taking a running minimum of those distances outward from the peak gives a monotonic envelope, so every percent can be located with a single binary search
+    if valley_idx < peak_idx:
+        distances = np.abs(value_series[valley_idx:peak_idx] - valley_value)
+        envelope = np.minimum.accumulate(distances[::-1])[::-1]
+        crossing_indices = valley_idx - 1 + np.searchsorted(envelope, threshold_distances, side="right")
+        neighbor_indices = crossing_indices + 1
+    else:
+        distances = np.abs(value_series[peak_idx + 1 : valley_idx + 1] - valley_value)
+        envelope = np.minimum.accumulate(distances)
+        crossing_indices = peak_idx + 1 + np.searchsorted(-envelope, -threshold_distances)
+        neighbor_indices = crossing_indices - 1
+    return np.asarray(
+        interpolate_x_for_y_between_two_points(
+            thresholds,
+            time_series[crossing_indices],
+            value_series[crossing_indices],
+            time_series[neighbor_indices],
+            value_series[neighbor_indices],
+        )
+    )
+
+
+def _calculate_width_values(
+    width_coordinates: Tuple[NDArray[float], NDArray[float], NDArray[float], NDArray[float]],
+    round_to_int: bool,
+) -> NDArray[float]:
+    """Calculate the width of every twitch at every width percent.
+
+    Args:
+        width_coordinates: the rising timepoints, rising thresholds, falling timepoints and falling thresholds returned by `_find_twitch_width_coordinates`
+        round_to_int: whether to round the widths to integers
+
+    Returns:
+        a 2D array where the rows are the twitches and the columns are the width percents
+    """
+    rising_timepoints, _, falling_timepoints, _ = width_coordinates
+    width_values: NDArray[float] = falling_timepoints - rising_timepoints
+    if round_to_int:
+        width_values = np.round(width_values)
+    return width_values
+
+
+def _pack_twitch_widths(
+    width_values: NDArray[float],
+    width_coordinates: Tuple[NDArray[float], NDArray[float], NDArray[float], NDArray[float]],
+    round_to_int: bool,
+) -> List[Dict[int, Dict[UUID, Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]],],]]:
+    """Convert the twitch width arrays into the per twitch dictionary format.
+
+    Args:
+        width_values: 2D array (twitches by width percents) of the widths returned by `_calculate_width_values`
+        width_coordinates: the rising timepoints, rising thresholds, falling timepoints and falling thresholds returned by `_find_twitch_width_coordinates`
+        round_to_int: whether to round the values to integers
+
+    Returns:
+        a list of dictionaries in the format returned by `calculate_twitch_widths`
+    """
     widths: List[
         Dict[
             int,
@@ -584,9 +783,8 @@ def calculate_twitch_widths(
             ],
         ]
     ] = list()
-    value_series = filtered_data[1, :]
-    time_series = filtered_data[0, :]
-    for iter_twitch_peak_idx, iter_twitch_indices_info in twitch_indices.items():
+    rising_timepoints, rising_thresholds, falling_timepoints, falling_thresholds = width_coordinates
+    for iter_twitch_idx in range(width_values.shape[0]):
         iter_width_dict: Dict[
             int,
             Dict[
@@ -594,49 +792,18 @@ def calculate_twitch_widths(
                 Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]],
             ],
         ] = dict()
-        peak_value = value_series[iter_twitch_peak_idx]
-        prior_valley_value = value_series[iter_twitch_indices_info[PRIOR_VALLEY_INDEX_UUID]]
-        subsequent_valley_value = value_series[iter_twitch_indices_info[SUBSEQUENT_VALLEY_INDEX_UUID]]
-
-        rising_amplitude = peak_value - prior_valley_value
-        falling_amplitude = peak_value - subsequent_valley_value
-
-        rising_idx = iter_twitch_peak_idx - 1
-        falling_idx = iter_twitch_peak_idx + 1
-        for iter_percent in TWITCH_WIDTH_PERCENTS:
+        for iter_percent_idx, iter_percent in enumerate(TWITCH_WIDTH_PERCENTS):
             iter_percent_dict: Dict[
                 UUID,
                 Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]],
             ] = dict()
-            rising_threshold = peak_value - iter_percent / 100 * rising_amplitude
-            falling_threshold = peak_value - iter_percent / 100 * falling_amplitude
-            # move to the left from the twitch peak until the threshold is reached
-            while abs(value_series[rising_idx] - prior_valley_value) > abs(
-                rising_threshold - prior_valley_value
-            ):
-                rising_idx -= 1
-            # move to the right from the twitch peak until the falling threshold is reached
-            while abs(value_series[falling_idx] - subsequent_valley_value) > abs(
-                falling_threshold - subsequent_valley_value
-            ):
-                falling_idx += 1
-            interpolated_rising_timepoint = interpolate_x_for_y_between_two_points(
-                rising_threshold,
-                time_series[rising_idx],
-                value_series[rising_idx],
-                time_series[rising_idx + 1],
-                value_series[rising_idx + 1],
-            )
-            interpolated_falling_timepoint = interpolate_x_for_y_between_two_points(
-                falling_threshold,
-                time_series[falling_idx],
-                value_series[falling_idx],
-                time_series[falling_idx - 1],
-                value_series[falling_idx - 1],
-            )
-            width_val = interpolated_falling_timepoint - interpolated_rising_timepoint
+            width_val = width_values[iter_twitch_idx, iter_percent_idx]
+            interpolated_rising_timepoint = rising_timepoints[iter_twitch_idx, iter_percent_idx]
+            interpolated_falling_timepoint = falling_timepoints[iter_twitch_idx, iter_percent_idx]
+            rising_threshold = rising_thresholds[iter_twitch_idx, iter_percent_idx]
+            falling_threshold = falling_thresholds[iter_twitch_idx, iter_percent_idx]
             if round_to_int:
-                width_val = int(round(width_val, 0))
+                width_val = int(width_val)
                 interpolated_falling_timepoint = int(round(interpolated_falling_timepoint, 0))
                 interpolated_rising_timepoint = int(round(interpolated_rising_timepoint, 0))
                 rising_threshold = int(round(rising_threshold, 0))
@@ -657,7 +824,7 @@ def calculate_twitch_widths(
 
 
 def calculate_area_under_curve(  # pylint:disable=too-many-locals # Eli (9/1/20): may be able to refactor before pull request
-    twitch_indices: Dict[int, Dict[UUID, Optional[int]]],
+    twitch_indices: Union[TwitchIndices, Dict[int, Dict[UUID, Optional[int]]]],
     filtered_data: NDArray[(2, Any), int],
     per_twitch_widths: List[
         Dict[
@@ -673,25 +840,22 @@ def calculate_area_under_curve(  # pylint:disable=too-many-locals # Eli (9/1/20)
     """Calculate the area under the curve (AUC) for twitches.
 
     Args:
-        twitch_indices: a dictionary in which the key is an integer representing the time points of all the peaks of interest and the value is an inner dictionary with various UUIDs of prior/subsequent peaks and valleys and their index values.
+        twitch_indices: the indices of the peaks of interest and of their prior/subsequent peaks and valleys, either as TwitchIndices or as the dictionary returned by find_twitch_indices
         filtered_data: a 2D array of the time and value (magnetic, voltage, displacement, force...) data after it has gone through noise filtering
         per_twitch_widths: a list of dictionaries where the first key is the percentage of the way down to the nearby valleys, the second key is a UUID representing either the value of the width, or the rising or falling coordinates. The final value is either an int representing the width value or a tuple of ints for the x/y coordinates
 
     Returns:
         a 1D array of integers which represent the area under the curve for each twitch
     """
+    twitch_indices = _as_twitch_indices(twitch_indices)
     width_percent = 90  # what percent of repolarization to use as the bottom limit for calculating AUC
-    auc_per_twitch: List[float] = list()
-    value_series = filtered_data[1, :]
-    time_series = filtered_data[0, :]
-
-    for iter_twitch_idx, (iter_twitch_peak_idx, iter_twitch_indices_info) in enumerate(
-        twitch_indices.items()
-    ):
-        # iter_twitch_peak_timepoint = time_series[iter_twitch_peak_idx]
+    num_twitches = len(twitch_indices)
+    rising_xs = np.empty(num_twitches, dtype=np.float64)
+    rising_ys = np.empty(num_twitches, dtype=np.float64)
+    falling_xs = np.empty(num_twitches, dtype=np.float64)
+    falling_ys = np.empty(num_twitches, dtype=np.float64)
+    for iter_twitch_idx in range(num_twitches):
         width_info = per_twitch_widths[iter_twitch_idx]
-        prior_valley_value = value_series[iter_twitch_indices_info[PRIOR_VALLEY_INDEX_UUID]]
-        subsequent_valley_value = value_series[iter_twitch_indices_info[SUBSEQUENT_VALLEY_INDEX_UUID]]
         rising_coords = width_info[width_percent][WIDTH_RISING_COORDS_UUID]
         falling_coords = width_info[width_percent][WIDTH_FALLING_COORDS_UUID]
 
@@ -705,112 +869,24 @@ def calculate_area_under_curve(  # pylint:disable=too-many-locals # Eli (9/1/20)
                 f"Falling coordinates under the key {WIDTH_FALLING_COORDS_UUID} must be a tuple."
             )
 
-        rising_x, rising_y = rising_coords
-        falling_x, falling_y = falling_coords
-
-        auc_total: Union[float, int] = 0
-
-        # calculate area of rising side
-        rising_idx = iter_twitch_peak_idx
-        # move to the left from the twitch peak until the threshold is reached
-        while abs(value_series[rising_idx - 1] - prior_valley_value) > abs(rising_y - prior_valley_value):
-            left_x = time_series[rising_idx - 1]
-            right_x = time_series[rising_idx]
-            left_y = value_series[rising_idx - 1]
-            right_y = value_series[rising_idx]
-
-            auc_total += _calculate_trapezoid_area(
-                left_x,
-                right_x,
-                left_y,
-                right_y,
-                rising_coords,
-                falling_coords,
-            )
-            rising_idx -= 1
-        # final trapezoid at the boundary of the interpolated twitch width point
-        left_x = rising_x
-        right_x = time_series[rising_idx]
-        left_y = rising_y
-        right_y = value_series[rising_idx]
-
-        auc_total += _calculate_trapezoid_area(
-            left_x,
-            right_x,
-            left_y,
-            right_y,
-            rising_coords,
-            falling_coords,
+        rising_xs[iter_twitch_idx], rising_ys[iter_twitch_idx] = rising_coords
+        falling_xs[iter_twitch_idx], falling_ys[iter_twitch_idx] = falling_coords
+
+    # the compiled kernel operates on double precision arrays regardless of the dtype of the incoming data, and walks every twitch in a single call
+    auc_per_twitch = np.asarray(
+        twitch_areas_under_curve(
+            filtered_data[0, :].astype(np.float64),
+            filtered_data[1, :].astype(np.float64),
+            np.asarray(twitch_indices.peak, dtype=np.intp),
+            np.asarray(twitch_indices.prior_valley, dtype=np.intp),
+            np.asarray(twitch_indices.subsequent_valley, dtype=np.intp),
+            rising_xs,
+            rising_ys,
+            falling_xs,
+            falling_ys,
         )
-
-        # calculate area of falling side
-        falling_idx = iter_twitch_peak_idx
-        # move to the left from the twitch peak until the threshold is reached
-        while abs(value_series[falling_idx + 1] - subsequent_valley_value) > abs(
-            falling_y - subsequent_valley_value
-        ):
-            left_x = time_series[falling_idx]
-            right_x = time_series[falling_idx + 1]
-            left_y = value_series[falling_idx]
-            right_y = value_series[falling_idx + 1]
-
-            auc_total += _calculate_trapezoid_area(
-                left_x,
-                right_x,
-                left_y,
-                right_y,
-                rising_coords,
-                falling_coords,
-            )
-            falling_idx += 1
-
-        # final trapezoid at the boundary of the interpolated twitch width point
-        left_x = time_series[falling_idx]
-        right_x = falling_x
-        left_y = value_series[rising_idx]
-        right_y = falling_y
-
-        auc_total += _calculate_trapezoid_area(
-            left_x,
-            right_x,
-            left_y,
-            right_y,
-            rising_coords,
-            falling_coords,
-        )
-        if round_to_int:
-            auc_total = int(round(auc_total, 0))
-        auc_per_twitch.append(auc_total)
-
-    return np.asarray(auc_per_twitch, dtype=float)
-
-
-def _calculate_trapezoid_area(
-    left_x: int,
-    right_x: int,
-    left_y: int,
-    right_y: int,
-    rising_coords: Tuple[Union[float, int], Union[float, int]],
-    falling_coords: Tuple[Union[float, int], Union[float, int]],
-) -> Union[int, float]:
-    """Calculate the area under the trapezoid.
-
-    Returns: area of the trapezoid
-    """
-    rising_x, rising_y = rising_coords
-    falling_x, falling_y = falling_coords
-
-    interp_y_for_lower_bound = partial(
-        interpolate_y_for_x_between_two_points,
-        x_1=rising_x,
-        y_1=rising_y,
-        x_2=falling_x,
-        y_2=falling_y,
     )
+    if round_to_int:
+        auc_per_twitch = np.round(auc_per_twitch)
 
-    trapezoid_h = right_x - left_x
-    trapezoid_left_side = abs(left_y - interp_y_for_lower_bound(left_x))
-    trapezoid_right_side = abs(right_y - interp_y_for_lower_bound(right_x))
-    auc_total = (trapezoid_left_side + trapezoid_right_side) / 2 * trapezoid_h
-
-    return auc_total
+    return auc_per_twitch
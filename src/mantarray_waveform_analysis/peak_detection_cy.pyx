@@ -0,0 +1,186 @@
+# cython: language_level=3
+# Make sure to set `linetrace=False` except when profiling cython code or creating annotation file. All performance tests should be timed without line tracing enabled. Cython files in this package can easily be recompiled with `pip install -e .`
+# cython: linetrace=False
+"""Compiled inner loops of Mantarray peak detection metrics."""
+import numpy as np
+
+
+cdef double _trapezoid_area(
+    double left_x,
+    double right_x,
+    double left_y,
+    double right_y,
+    double rising_x,
+    double rising_y,
+    double slope,
+):
+    """Calculate the area of a trapezoid above the line between the twitch width coordinates."""
+    cdef double trapezoid_h, trapezoid_left_side, trapezoid_right_side
+    trapezoid_h = right_x - left_x
+    trapezoid_left_side = abs(left_y - (slope * (left_x - rising_x) + rising_y))
+    trapezoid_right_side = abs(right_y - (slope * (right_x - rising_x) + rising_y))
+    return (trapezoid_left_side + trapezoid_right_side) / 2 * trapezoid_h
+
+
+cdef double _twitch_area_under_curve(
+    double[:] time_series,
+    double[:] value_series,
+    Py_ssize_t peak_idx,
+    double prior_valley_value,
+    double subsequent_valley_value,
+    double rising_x,
+    double rising_y,
+    double falling_x,
+    double falling_y,
+):
+    """Calculate the area under the curve of a single twitch.
+
+    Sums the trapezoids between the curve and the line connecting the rising and falling twitch width coordinates, walking outwards from the peak in both directions until the twitch width threshold is reached.
+
+    Args:
+        time_series: 1D array of the time values of the data
+        value_series: 1D array of the values (magnetic, voltage, displacement, force...) of the data
+        peak_idx: the index of the twitch peak
+        prior_valley_value: the value of the valley before the twitch
+        subsequent_valley_value: the value of the valley after the twitch
+        rising_x: the time of the rising twitch width coordinate
+        rising_y: the value of the rising twitch width coordinate
+        falling_x: the time of the falling twitch width coordinate
+        falling_y: the value of the falling twitch width coordinate
+
+    Returns:
+        the area under the curve of the twitch
+    """
+    # the baseline slope and the thresholds that end each walk are constant for the whole twitch
+    cdef double slope = (falling_y - rising_y) / (falling_x - rising_x)
+    cdef double rising_threshold = abs(rising_y - prior_valley_value)
+    cdef double falling_threshold = abs(falling_y - subsequent_valley_value)
+    cdef double auc_total = 0
+    cdef Py_ssize_t rising_idx, falling_idx
+
+    # calculate area of rising side
+    rising_idx = peak_idx
+    # move to the left from the twitch peak until the threshold is reached
+    while abs(value_series[rising_idx - 1] - prior_valley_value) > rising_threshold:
+        auc_total += _trapezoid_area(
+            time_series[rising_idx - 1],
+            time_series[rising_idx],
+            value_series[rising_idx - 1],
+            value_series[rising_idx],
+            rising_x,
+            rising_y,
+            slope,
+        )
+        rising_idx -= 1
+    # final trapezoid at the boundary of the interpolated twitch width point
+    auc_total += _trapezoid_area(
+        rising_x, time_series[rising_idx], rising_y, value_series[rising_idx], rising_x, rising_y, slope
+    )
+
+    # calculate area of falling side
+    falling_idx = peak_idx
+    # move to the right from the twitch peak until the threshold is reached
+    while abs(value_series[falling_idx + 1] - subsequent_valley_value) > falling_threshold:
+        auc_total += _trapezoid_area(
+            time_series[falling_idx],
+            time_series[falling_idx + 1],
+            value_series[falling_idx],
+            value_series[falling_idx + 1],
+            rising_x,
+            rising_y,
+            slope,
+        )
+        falling_idx += 1
+
+    # final trapezoid at the boundary of the interpolated twitch width point
+    auc_total += _trapezoid_area(
+        time_series[falling_idx], falling_x, value_series[rising_idx], falling_y, rising_x, rising_y, slope
+    )
+    return auc_total
+
+
+cpdef double[:] twitch_areas_under_curve(
+    double[:] time_series,
+    double[:] value_series,
+    Py_ssize_t[:] peak_indices,
+    Py_ssize_t[:] prior_valley_indices,
+    Py_ssize_t[:] subsequent_valley_indices,
+    double[:] rising_xs,
+    double[:] rising_ys,
+    double[:] falling_xs,
+    double[:] falling_ys,
+):
+    """Calculate the area under the curve of every twitch in a single call.
+
+    All the twitch arrays are parallel, element ``i`` of each describing the same twitch.
+
+    Args:
+        time_series: 1D array of the time values of the data
+        value_series: 1D array of the values (magnetic, voltage, displacement, force...) of the data
+        peak_indices: the index of each twitch peak
+        prior_valley_indices: the index of the valley before each twitch
+        subsequent_valley_indices: the index of the valley after each twitch
+        rising_xs: the time of the rising twitch width coordinate of each twitch
+        rising_ys: the value of the rising twitch width coordinate of each twitch
+        falling_xs: the time of the falling twitch width coordinate of each twitch
+        falling_ys: the value of the falling twitch width coordinate of each twitch
+
+    Returns:
+        the area under the curve of each twitch
+    """
+    cdef Py_ssize_t num_twitches = peak_indices.shape[0]
+    cdef double[:] areas = np.empty(num_twitches, dtype=np.float64)
+    cdef Py_ssize_t i
+    for i in range(num_twitches):
+        areas[i] = _twitch_area_under_curve(
+            time_series,
+            value_series,
+            peak_indices[i],
+            value_series[prior_valley_indices[i]],
+            value_series[subsequent_valley_indices[i]],
+            rising_xs[i],
+            rising_ys[i],
+            falling_xs[i],
+            falling_ys[i],
+        )
+    return areas
+
+
+cpdef (Py_ssize_t, Py_ssize_t) find_back_to_back_features(
+    Py_ssize_t[:] peak_indices,
+    Py_ssize_t[:] valley_indices,
+    bint starts_with_peak,
+):
+    """Find the first place where peaks and valleys do not alternate.
+
+    Args:
+        peak_indices: a 1D array of integers representing the indices of the peaks
+        valley_indices: a 1D array of integers representing the indices of the valleys
+        starts_with_peak: whether or not a peak rather than a valley comes first
+
+    Returns:
+        the position in peak_indices of the first of two back-to-back peaks and the position in valley_indices of the first of two back-to-back valleys. At most one of them is found, the other (or both) being -1
+    """
+    cdef Py_ssize_t num_peaks = peak_indices.shape[0]
+    cdef Py_ssize_t num_valleys = valley_indices.shape[0]
+    cdef bint prev_feature_is_peak = starts_with_peak
+    # the feature that comes first has already been visited
+    cdef Py_ssize_t peak_idx = 1 if starts_with_peak else 0
+    cdef Py_ssize_t valley_idx = 0 if starts_with_peak else 1
+
+    while peak_idx < num_peaks and valley_idx < num_valleys:
+        if prev_feature_is_peak:
+            if valley_indices[valley_idx] > peak_indices[peak_idx]:
+                return peak_idx - 1, -1
+            valley_idx += 1
+        else:
+            if valley_indices[valley_idx] < peak_indices[peak_idx]:
+                return -1, valley_idx - 1
+            peak_idx += 1
+        prev_feature_is_peak = not prev_feature_is_peak
+    # any features remaining after the other kind has run out are back-to-back
+    if peak_idx < num_peaks - 1:
+        return peak_idx, -1
+    if valley_idx < num_valleys - 1:
+        return -1, valley_idx
+    return -1, -1
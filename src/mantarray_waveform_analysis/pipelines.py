@@ -62,7 +62,10 @@ class Pipeline:
                 Dict[
                     UUID,
                     Union[
-                        Dict[int, Dict[UUID, Union[Tuple[int, int], int]]],
+                        Dict[
+                            int,
+                            Dict[UUID, Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]]],
+                        ],
                         Union[float, int],
                     ],
                 ],
@@ -81,7 +84,10 @@ class Pipeline:
                 Dict[
                     UUID,
                     Union[
-                        Dict[int, Dict[UUID, Union[Tuple[int, int], int]]],
+                        Dict[
+                            int,
+                            Dict[UUID, Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]]],
+                        ],
                         Union[float, int],
                     ],
                 ],
@@ -100,7 +106,10 @@ class Pipeline:
                 Dict[
                     UUID,
                     Union[
-                        Dict[int, Dict[UUID, Union[Tuple[int, int], int]]],
+                        Dict[
+                            int,
+                            Dict[UUID, Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]]],
+                        ],
                         Union[float, int],
                     ],
                 ],
@@ -227,7 +236,10 @@ class Pipeline:
             Dict[
                 UUID,
                 Union[
-                    Dict[int, Dict[UUID, Union[Tuple[int, int], int]]],
+                    Dict[
+                        int,
+                        Dict[UUID, Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]]],
+                    ],
                     Union[float, int],
                 ],
             ],
@@ -255,7 +267,10 @@ class Pipeline:
             Dict[
                 UUID,
                 Union[
-                    Dict[int, Dict[UUID, Union[Tuple[int, int], int]]],
+                    Dict[
+                        int,
+                        Dict[UUID, Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]]],
+                    ],
                     Union[float, int],
                 ],
             ],
@@ -283,7 +298,10 @@ class Pipeline:
             Dict[
                 UUID,
                 Union[
-                    Dict[int, Dict[UUID, Union[Tuple[int, int], int]]],
+                    Dict[
+                        int,
+                        Dict[UUID, Union[Tuple[Union[float, int], Union[float, int]], Union[float, int]]],
+                    ],
                     Union[float, int],
                 ],
             ],
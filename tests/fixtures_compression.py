@@ -4,16 +4,23 @@
 import pytest
 
 from .fixtures_utils import _run_peak_detection
+from .fixtures_utils import fixture_raw_generic_well_a1
+from .fixtures_utils import fixture_raw_generic_well_a2
+
+__fixtures__ = [
+    fixture_raw_generic_well_a1,
+    fixture_raw_generic_well_a2,
+]
 
 
 @pytest.fixture(scope="session", name="new_A1")
-def fixture_new_A1():
-    return _run_peak_detection("new_A1_tsv.tsv")
+def fixture_new_A1(raw_generic_well_a1):
+    return _run_peak_detection("new_A1_tsv.tsv", raw_data=raw_generic_well_a1)
 
 
 @pytest.fixture(scope="session", name="new_A2")
-def fixture_new_A2():
-    return _run_peak_detection("new_A2_tsv.tsv")
+def fixture_new_A2(raw_generic_well_a2):
+    return _run_peak_detection("new_A2_tsv.tsv", raw_data=raw_generic_well_a2)
 
 
 @pytest.fixture(scope="session", name="new_A3")
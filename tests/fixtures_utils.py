@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
-import csv
 import os
-from typing import List
+from typing import Any
+from typing import Dict
 from typing import Optional
 from typing import Tuple
+from uuid import UUID
 
 from mantarray_file_manager import WellFile
 from mantarray_waveform_analysis import BESSEL_LOWPASS_30_UUID
@@ -11,50 +12,42 @@ from mantarray_waveform_analysis import CENTIMILLISECONDS_PER_SECOND
 from mantarray_waveform_analysis import peak_detection
 from mantarray_waveform_analysis import peak_detector
 from mantarray_waveform_analysis import PipelineTemplate
-import matplotlib
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from nptyping import NDArray
 import numpy as np
 import pytest
 from stdlib_utils import get_current_file_abs_directory
 
 
-matplotlib.use("Agg")
 PATH_OF_CURRENT_FILE = get_current_file_abs_directory()
 
 
 PATH_TO_DATASETS = os.path.join(PATH_OF_CURRENT_FILE, "datasets")
 PATH_TO_PNGS = os.path.join(PATH_OF_CURRENT_FILE, "pngs")
 
+# a single figure is reused (and cleared) for every call to _plot_data rather than creating and closing a new one each time. A low DPI is plenty for these diagnostic images and keeps rendering/encoding them cheap
+_PLOT_FIGURE = Figure(dpi=72)
+FigureCanvasAgg(_PLOT_FIGURE)  # figures created outside of pyplot need a canvas attached explicitly
+_PLOT_AXES = _PLOT_FIGURE.add_subplot()
+# fixed margins (leaving room for the legend below the axes) instead of re-solving the layout with tight_layout for every plot
+_PLOT_FIGURE.subplots_adjust(left=0.16, right=0.97, top=0.95, bottom=0.25)
 
-def _load_file(file_path: str) -> Tuple[List[str], List[str]]:
-    time = []
-    v = []
-    header_placer = []  # used to get rid of the header
-    with open(file_path, "r") as file_name:
-        file_reader = csv.reader(file_name, delimiter=",")
-        header = next(file_reader)
-        header_placer.append(header)
-        for row in file_reader:
-            # row variable is a list that represents a row in csv
-            time.append(row[0])
-            v.append(row[1])
+
+def _load_file(file_path: str) -> Tuple[NDArray[int], NDArray[int]]:
+    # skip the header row
+    time, v = np.loadtxt(file_path, delimiter=",", skiprows=1, usecols=(0, 1), dtype=np.int32, unpack=True)
     return time, v
 
 
-def _load_file_tsv(file_path: str) -> Tuple[List[str], List[str]]:
-    time = []
-    v = []
-    with open(file_path, "r") as file_name:
-        file_reader = csv.reader(file_name, delimiter="\t")
-        for row in file_reader:
-            time.append(row[0])
-            v.append(row[1])
+def _load_file_tsv(file_path: str) -> Tuple[NDArray[int], NDArray[int]]:
+    time, v = np.loadtxt(file_path, delimiter="\t", usecols=(0, 1), dtype=np.int32, unpack=True)
     return time, v
 
 
 def _load_file_h5(
     file_path: str, sampling_rate_construct: int, x_range: Optional[Tuple[int, int]]
-) -> Tuple[List[str], List[str]]:
+) -> Tuple[NDArray[int], NDArray[int]]:
     wf = WellFile(file_path)
     tissue_data = wf.get_raw_tissue_reading()
     if x_range is None:
@@ -65,10 +58,10 @@ def _load_file_h5(
 
 
 def create_numpy_array_of_raw_gmr_from_python_arrays(time_array, gmr_array):
-    time = np.array(time_array, dtype=np.int32)
-    v = np.array(gmr_array, dtype=np.int32)
-
-    data = np.array([time, v], dtype=np.int32)
+    # fill the rows of a single preallocated array instead of converting each input and then stacking them
+    data = np.empty((2, len(time_array)), dtype=np.int32)
+    data[0] = time_array
+    data[1] = gmr_array
     return data
 
 
@@ -79,17 +72,19 @@ def _run_peak_detection(
     time_scaling_factor=None,
     noise_filter_uuid=None,
     x_range=None,
+    raw_data=None,
 ):
-    the_path = os.path.join(PATH_TO_DATASETS, filename)
-    time, v = (
-        _load_file_h5(the_path, sampling_rate_construct, x_range=x_range)
-        if filename.endswith(".h5")
-        else _load_file_tsv(the_path)
-    )
+    if raw_data is None:
+        the_path = os.path.join(PATH_TO_DATASETS, filename)
+        time, v = (
+            _load_file_h5(the_path, sampling_rate_construct, x_range=x_range)
+            if filename.endswith(".h5")
+            else _load_file_tsv(the_path)
+        )
+        # create numpy matrix
+        raw_data = create_numpy_array_of_raw_gmr_from_python_arrays(time, v)
     if noise_filter_uuid is None:
         noise_filter_uuid = BESSEL_LOWPASS_30_UUID if filename.endswith(".h5") else None
-    # create numpy matrix
-    raw_data = create_numpy_array_of_raw_gmr_from_python_arrays(time, v)
     simple_pipeline_template = PipelineTemplate(
         tissue_sampling_period=1 / sampling_rate_construct * CENTIMILLISECONDS_PER_SECOND,
         noise_filter_uuid=noise_filter_uuid,
@@ -107,78 +102,72 @@ def _plot_data(
     my_local_path_graphs,
     x_bounds: Tuple[int, int] = (0, 20),
 ):
+    # the images are only diagnostic artifacts that no assertion depends on, so rendering them can be skipped (e.g. in CI) by setting PYTEST_SKIP_PLOTS=1
+    if os.environ.get("PYTEST_SKIP_PLOTS") == "1":
+        return
     time_series = filtered_data[0, :]
     peak_indices, valley_indices = peak_and_valley_indices
 
-    time_series_in_bounds = [
-        t
-        for t in time_series
-        if (t / CENTIMILLISECONDS_PER_SECOND > x_bounds[0] and t / CENTIMILLISECONDS_PER_SECOND < x_bounds[1])
-    ]
-    waveforms_in_bounds = [
-        y_val
-        for idx, y_val in enumerate(filtered_data[1, :])
-        if (
-            time_series[idx] / CENTIMILLISECONDS_PER_SECOND > x_bounds[0]
-            and time_series[idx] / CENTIMILLISECONDS_PER_SECOND < x_bounds[1]
-        )
-    ]
-    peak_indices = [
-        idx
-        for idx in peak_indices
-        if (
-            time_series[idx] / CENTIMILLISECONDS_PER_SECOND > x_bounds[0]
-            and time_series[idx] / CENTIMILLISECONDS_PER_SECOND < x_bounds[1]
-        )
-    ]
-    valley_indices = [
-        idx
-        for idx in valley_indices
-        if (
-            time_series[idx] / CENTIMILLISECONDS_PER_SECOND > x_bounds[0]
-            and time_series[idx] / CENTIMILLISECONDS_PER_SECOND < x_bounds[1]
-        )
-    ]
-
-    plt.figure()
-    plt.plot(time_series_in_bounds, waveforms_in_bounds, "g")
-    plt.plot(
+    # time is monotonically increasing, so the (exclusive) bounds are a contiguous slice that can be found with a binary search
+    start_idx = int(np.searchsorted(time_series, x_bounds[0] * CENTIMILLISECONDS_PER_SECOND, side="right"))
+    stop_idx = int(np.searchsorted(time_series, x_bounds[1] * CENTIMILLISECONDS_PER_SECOND, side="left"))
+    time_series_in_bounds = time_series[start_idx:stop_idx]
+    waveforms_in_bounds = filtered_data[1, start_idx:stop_idx]
+    peak_indices = np.asarray(peak_indices, dtype=int)
+    peak_indices = peak_indices[(peak_indices >= start_idx) & (peak_indices < stop_idx)]
+    valley_indices = np.asarray(valley_indices, dtype=int)
+    valley_indices = valley_indices[(valley_indices >= start_idx) & (valley_indices < stop_idx)]
+
+    _PLOT_AXES.plot(time_series_in_bounds, waveforms_in_bounds, "g")
+    _PLOT_AXES.plot(
         time_series[peak_indices],
         filtered_data[1][peak_indices],
         "bo",
         label="peaks",
         fillstyle="none",
     )
-    plt.plot(
+    _PLOT_AXES.plot(
         time_series[valley_indices],
         filtered_data[1][valley_indices],
         "ro",
         label="valleys",
         fillstyle="none",
     )
-    plt.xlabel("Time (centimilliseconds)")
-    plt.ylabel("Magnetic Signal")
-    plt.legend(bbox_to_anchor=(0, -0.25), loc="lower center")
-    plt.tight_layout()
-    plt.savefig(my_local_path_graphs)
-    plt.close()
+    _PLOT_AXES.set_xlabel("Time (centimilliseconds)")
+    _PLOT_AXES.set_ylabel("Magnetic Signal")
+    _PLOT_AXES.legend(bbox_to_anchor=(0, -0.25), loc="lower center")
+    _PLOT_FIGURE.savefig(my_local_path_graphs)
+    _PLOT_AXES.cla()
+
+
+# the well fixtures are session scoped and never mutated, so their metrics only need to be calculated once per session. The fixture itself is stored alongside its metrics so that its id cannot be reused by another object while cached
+_DATA_METRICS_CACHE: Dict[Tuple[int, bool], Tuple[Any, Tuple[Dict[int, Any], Dict[UUID, Any]]]] = {}
+
+
+def _get_cached_data_metrics(well_fixture, rounded):
+    cache_key = (id(well_fixture), rounded)
+    if cache_key not in _DATA_METRICS_CACHE:
+        pipeline, peak_and_valley_indices = well_fixture
+        filtered_data = pipeline.get_noise_filtered_gmr()
+        _DATA_METRICS_CACHE[cache_key] = (
+            well_fixture,
+            peak_detection.data_metrics(peak_and_valley_indices, filtered_data, rounded=rounded),
+        )
+    return _DATA_METRICS_CACHE[cache_key][1]
 
 
 def _get_data_metrics(well_fixture):
-    pipeline, peak_and_valley_indices = well_fixture
-    filtered_data = pipeline.get_noise_filtered_gmr()
-    return peak_detection.data_metrics(peak_and_valley_indices, filtered_data)
+    return _get_cached_data_metrics(well_fixture, rounded=True)
 
 
 def _get_unrounded_data_metrics(well_fixture):
-    pipeline, peak_and_valley_indices = well_fixture
-    filtered_data = pipeline.get_noise_filtered_gmr()
-    return peak_detection.data_metrics(peak_and_valley_indices, filtered_data, rounded=False)
+    return _get_cached_data_metrics(well_fixture, rounded=False)
 
 
 def assert_percent_diff(actual, expected, threshold=0.0006):
-    percent_diff = abs(actual - expected) / expected
-    assert percent_diff < threshold
+    # also accepts arrays of values, which are all checked in a single vectorized comparison
+    percent_diff = np.abs(np.asarray(actual) - np.asarray(expected)) / np.asarray(expected)
+    assert np.all(percent_diff < threshold)
 
 
 @pytest.fixture(scope="session", name="raw_generic_well_a1")
@@ -10,7 +10,6 @@ from mantarray_waveform_analysis import peak_detector
 from mantarray_waveform_analysis import TWITCH_PERIOD_UUID
 from mantarray_waveform_analysis import WIDTH_UUID
 from mantarray_waveform_analysis import WIDTH_VALUE_UUID
-import matplotlib
 import numpy as np
 from stdlib_utils import get_current_file_abs_directory
 
@@ -24,9 +23,10 @@ from .fixtures_pipelines import fixture_generic_pipeline_template
 from .fixtures_utils import _get_data_metrics
 from .fixtures_utils import _plot_data
 from .fixtures_utils import assert_percent_diff
+from .fixtures_utils import fixture_raw_generic_well_a1
+from .fixtures_utils import fixture_raw_generic_well_a2
 from .fixtures_utils import PATH_TO_PNGS
 
-matplotlib.use("Agg")
 PATH_OF_CURRENT_FILE = get_current_file_abs_directory()
 
 COMPRESSION_ACCURACY = 0.10
@@ -41,6 +41,8 @@ __fixtures__ = (
     fixture_new_A5,
     fixture_new_A6,
     fixture_generic_pipeline_template,
+    fixture_raw_generic_well_a1,
+    fixture_raw_generic_well_a2,
 )
 
 
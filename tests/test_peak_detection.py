@@ -5,10 +5,12 @@ import os
 from mantarray_waveform_analysis import AMPLITUDE_UUID
 from mantarray_waveform_analysis import AUC_UUID
 from mantarray_waveform_analysis import CONTRACTION_VELOCITY_UUID
+from mantarray_waveform_analysis import find_twitch_index_arrays
 from mantarray_waveform_analysis import find_twitch_indices
 from mantarray_waveform_analysis import IRREGULARITY_INTERVAL_UUID
 from mantarray_waveform_analysis import MIN_NUMBER_PEAKS
 from mantarray_waveform_analysis import MIN_NUMBER_VALLEYS
+from mantarray_waveform_analysis import peak_detection
 from mantarray_waveform_analysis import peak_detector
 from mantarray_waveform_analysis import PRIOR_PEAK_INDEX_UUID
 from mantarray_waveform_analysis import PRIOR_VALLEY_INDEX_UUID
@@ -18,14 +20,15 @@ from mantarray_waveform_analysis import SUBSEQUENT_VALLEY_INDEX_UUID
 from mantarray_waveform_analysis import TooFewPeaksDetectedError
 from mantarray_waveform_analysis import TWITCH_FREQUENCY_UUID
 from mantarray_waveform_analysis import TWITCH_PERIOD_UUID
+from mantarray_waveform_analysis import TwitchIndices
 from mantarray_waveform_analysis import TwoPeaksInARowError
 from mantarray_waveform_analysis import TwoValleysInARowError
 from mantarray_waveform_analysis import WIDTH_FALLING_COORDS_UUID
 from mantarray_waveform_analysis import WIDTH_RISING_COORDS_UUID
 from mantarray_waveform_analysis import WIDTH_UUID
 from mantarray_waveform_analysis import WIDTH_VALUE_UUID
-import matplotlib
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
 import pytest
 from pytest import approx
@@ -47,16 +50,12 @@ from .fixtures_peak_detection import fixture_noisy_data_A1
 from .fixtures_peak_detection import fixture_noisy_data_B1
 from .fixtures_utils import _get_data_metrics
 from .fixtures_utils import _get_unrounded_data_metrics
-from .fixtures_utils import _load_file_tsv
 from .fixtures_utils import _plot_data
 from .fixtures_utils import assert_percent_diff
-from .fixtures_utils import create_numpy_array_of_raw_gmr_from_python_arrays
-from .fixtures_utils import PATH_TO_DATASETS
+from .fixtures_utils import fixture_raw_generic_well_a1
+from .fixtures_utils import fixture_raw_generic_well_a2
 from .fixtures_utils import PATH_TO_PNGS
 
-matplotlib.use("Agg")
-
-
 __fixtures__ = [
     fixture_maiden_voyage_data,
     fixture_new_A1,
@@ -73,74 +72,65 @@ __fixtures__ = [
     fixture_MA202000127__2021_03_26_174059__A3,
     fixture_MA202000127__2021_04_20_212922__A3,
     fixture_MA20123456__2020_08_17_145752__A1,
+    fixture_raw_generic_well_a1,
+    fixture_raw_generic_well_a2,
 ]
 
 
+_WIDTH_PERCENT_COLORS = (
+    "k",
+    "r",
+    "g",
+    "b",
+    "c",
+    "m",
+    "y",
+    "k",
+    "darkred",
+    "darkgreen",
+    "darkblue",
+    "darkcyan",
+    "darkmagenta",
+    "orange",
+    "gray",
+    "lime",
+    "crimson",
+    "yellow",
+)
+
+
+# a single figure is reused (and cleared) for every width plot. It is created through the object API, so no global pyplot state is involved
+_WIDTHS_FIGURE = Figure()
+FigureCanvasAgg(_WIDTHS_FIGURE)
+_WIDTHS_AXES = _WIDTHS_FIGURE.add_subplot()
+
+
 def _plot_twitch_widths(filtered_data, per_twitch_dict, my_local_path_graphs):
+    # rendering the width coordinates of every twitch is slow and the images are only useful when inspecting them by eye, so only plot when opted in by setting PYTEST_PLOT_WIDTHS=1
+    if os.environ.get("PYTEST_PLOT_WIDTHS") != "1":
+        return
     # plot and save results
-    plt.figure()
-    plt.plot(filtered_data[0, :], filtered_data[1, :])
-    label_made = False
-    for twitch in per_twitch_dict:
-        percent_dict = per_twitch_dict[twitch][WIDTH_UUID]
-        clrs = [
-            "k",
-            "r",
-            "g",
-            "b",
-            "c",
-            "m",
-            "y",
-            "k",
-            "darkred",
-            "darkgreen",
-            "darkblue",
-            "darkcyan",
-            "darkmagenta",
-            "orange",
-            "gray",
-            "lime",
-            "crimson",
-            "yellow",
-        ]
-        count = 0
-        for percent in reversed(list(percent_dict.keys())):
-            rising_x = percent_dict[percent][WIDTH_RISING_COORDS_UUID][0]
-            falling_x = percent_dict[percent][WIDTH_FALLING_COORDS_UUID][0]
-            if not label_made:
-                plt.plot(
-                    rising_x,
-                    percent_dict[percent][WIDTH_RISING_COORDS_UUID][1],
-                    "o",
-                    color=clrs[count],
-                    label=percent,
-                )
-                plt.plot(
-                    falling_x,
-                    percent_dict[percent][WIDTH_FALLING_COORDS_UUID][1],
-                    "o",
-                    color=clrs[count],
-                )
-            else:
-                plt.plot(
-                    rising_x,
-                    percent_dict[percent][WIDTH_RISING_COORDS_UUID][1],
-                    "o",
-                    color=clrs[count],
-                )
-                plt.plot(
-                    falling_x,
-                    percent_dict[percent][WIDTH_FALLING_COORDS_UUID][1],
-                    "o",
-                    color=clrs[count],
-                )
-            count += 1
-            if count > 16:
-                label_made = True
-    plt.legend(loc="best")
-    plt.xlabel("Time (centimilliseconds)")
-    plt.ylabel("Voltage (V)")
-    plt.savefig(my_local_path_graphs)
+    _WIDTHS_AXES.plot(filtered_data[0, :], filtered_data[1, :])
+    width_dicts = [per_twitch_dict[twitch][WIDTH_UUID] for twitch in per_twitch_dict]
+    # draw the rising and falling coordinates of every twitch for a given percent as a single scatter
+    for count, percent in enumerate(reversed(list(width_dicts[0].keys()))):
+        coords = np.array(
+            [
+                width_dict[percent][WIDTH_RISING_COORDS_UUID] + width_dict[percent][WIDTH_FALLING_COORDS_UUID]
+                for width_dict in width_dicts
+            ]
+        )
+        _WIDTHS_AXES.scatter(
+            np.concatenate((coords[:, 0], coords[:, 2])),
+            np.concatenate((coords[:, 1], coords[:, 3])),
+            color=_WIDTH_PERCENT_COLORS[count],
+            label=percent,
+        )
+    _WIDTHS_AXES.legend(loc="best")
+    _WIDTHS_AXES.set_xlabel("Time (centimilliseconds)")
+    _WIDTHS_AXES.set_ylabel("Voltage (V)")
+    _WIDTHS_FIGURE.savefig(my_local_path_graphs)
+    _WIDTHS_AXES.cla()
 
 
 def test_new_A1_period(new_A1):
@@ -166,127 +156,91 @@ def test_new_A1_frequency(new_A1):
     assert per_twitch_dict[105000][TWITCH_FREQUENCY_UUID] == approx(1.2345679)
 
 
-def test_new_A2_period(new_A2):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A2)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["n"] == 11
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["mean"], 80182)
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["std"], 2289)
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["min"] == 77000
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["max"] == 85000
-    # test data_metrics per beat dictionary
-    assert per_twitch_dict[104000][TWITCH_PERIOD_UUID] == 81000
-    assert per_twitch_dict[185000][TWITCH_PERIOD_UUID] == 77000
-    assert per_twitch_dict[262000][TWITCH_PERIOD_UUID] == 85000
-
-
-def test_new_A3_period(new_A3):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A3)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["n"] == 10
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["mean"], 80182)
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["std"], 4600)
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["min"] == 73000
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["max"] == 85000
-    # test data_metrics per beat dictionary
-    assert per_twitch_dict[108000][TWITCH_PERIOD_UUID] == 85000
-    assert per_twitch_dict[193000][TWITCH_PERIOD_UUID] == 73000
-    assert per_twitch_dict[266000][TWITCH_PERIOD_UUID] == 85000
-
-
-def test_new_A4_period(new_A4):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A4)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["n"] == 15
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["mean"], 57667)
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["std"], 1247)
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["min"] == 56000
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["max"] == 59000
-    # test data_metrics per beat dictionary
-    assert per_twitch_dict[81000][TWITCH_PERIOD_UUID] == 56000
-    assert per_twitch_dict[137000][TWITCH_PERIOD_UUID] == 59000
-    assert per_twitch_dict[196000][TWITCH_PERIOD_UUID] == 59000
-
-
-def test_new_A5_period(new_A5):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A5)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["n"] == 15
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["mean"], 58000)
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["std"], 1265)
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["min"] == 55000
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["max"] == 59000
-    # test data_metrics per beat dictionary
-    assert per_twitch_dict[80000][TWITCH_PERIOD_UUID] == 58000
-    assert per_twitch_dict[138000][TWITCH_PERIOD_UUID] == 59000
-    assert per_twitch_dict[197000][TWITCH_PERIOD_UUID] == 58000
-
-
-def test_new_A6_period(new_A6):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A6)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["n"] == 15
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["mean"], 57667)
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["std"], 4922)
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["min"] == 48000
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["max"] == 66000
-    # test data_metrics per beat dictionary
-    assert per_twitch_dict[88000][TWITCH_PERIOD_UUID] == 60000
-    assert per_twitch_dict[148000][TWITCH_PERIOD_UUID] == 53000
-    assert per_twitch_dict[201000][TWITCH_PERIOD_UUID] == 54000
-
-
-def test_maiden_voyage_data_period(maiden_voyage_data):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(maiden_voyage_data)
+@pytest.mark.parametrize(
+    "well_fixture_name,expected_aggregate_stats,expected_per_twitch_periods",
+    [
+        (
+            "new_A2",
+            (11, 80182, 2289, 77000, 85000),
+            {104000: 81000, 185000: 77000, 262000: 85000},
+        ),
+        (
+            "new_A3",
+            (10, 80182, 4600, 73000, 85000),
+            {108000: 85000, 193000: 73000, 266000: 85000},
+        ),
+        (
+            "new_A4",
+            (15, 57667, 1247, 56000, 59000),
+            {81000: 56000, 137000: 59000, 196000: 59000},
+        ),
+        (
+            "new_A5",
+            (15, 58000, 1265, 55000, 59000),
+            {80000: 58000, 138000: 59000, 197000: 58000},
+        ),
+        (
+            "new_A6",
+            (15, 57667, 4922, 48000, 66000),
+            {88000: 60000, 148000: 53000, 201000: 54000},
+        ),
+        (
+            "maiden_voyage_data",
+            (10, 81400, 1480, 78500, 83500),
+            {123500: 83000, 449500: 80000, 856000: 81500},
+        ),
+    ],
+)
+def test_period__matches_expected_values_of_well(
+    well_fixture_name, expected_aggregate_stats, expected_per_twitch_periods, request
+):
+    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(request.getfixturevalue(well_fixture_name))
+    expected_n, expected_mean, expected_std, expected_min, expected_max = expected_aggregate_stats
 
     # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["n"] == 10
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["mean"], 81400)
-    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["std"], 1480)
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["min"] == 78500
-    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["max"] == 83500
+    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["n"] == expected_n
+    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["mean"], expected_mean)
+    assert_percent_diff(aggregate_metrics_dict[TWITCH_PERIOD_UUID]["std"], expected_std)
+    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["min"] == expected_min
+    assert aggregate_metrics_dict[TWITCH_PERIOD_UUID]["max"] == expected_max
 
     # test data_metrics per beat dictionary
-    assert per_twitch_dict[123500][TWITCH_PERIOD_UUID] == 83000
-    assert per_twitch_dict[449500][TWITCH_PERIOD_UUID] == 80000
-    assert per_twitch_dict[856000][TWITCH_PERIOD_UUID] == 81500
+    for twitch_timepoint, expected_period in expected_per_twitch_periods.items():
+        assert per_twitch_dict[twitch_timepoint][TWITCH_PERIOD_UUID] == expected_period
 
 
 def test_new_A1_contraction_velocity(new_A1):
     per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A1)
 
     # test data_metrics per beat dictionary
-    assert_percent_diff(per_twitch_dict[105000][CONTRACTION_VELOCITY_UUID], 6.474188398084087)
-    assert_percent_diff(per_twitch_dict[186000][CONTRACTION_VELOCITY_UUID], 5.99059)
-    assert_percent_diff(per_twitch_dict[266000][CONTRACTION_VELOCITY_UUID], 6.800115874855156)
+    assert_percent_diff(
+        [per_twitch_dict[timepoint][CONTRACTION_VELOCITY_UUID] for timepoint in (105000, 186000, 266000)],
+        [6.474188398084087, 5.99059, 6.800115874855156],
+    )
 
     # test data_metrics aggregate dictionary
     assert aggregate_metrics_dict[CONTRACTION_VELOCITY_UUID]["n"] == 11
-    assert_percent_diff(aggregate_metrics_dict[CONTRACTION_VELOCITY_UUID]["mean"], 6.440001805351568)
-    assert_percent_diff(aggregate_metrics_dict[CONTRACTION_VELOCITY_UUID]["std"], 0.2531719477692566)
-    assert_percent_diff(aggregate_metrics_dict[CONTRACTION_VELOCITY_UUID]["min"], 5.990590432409137)
-    assert_percent_diff(aggregate_metrics_dict[CONTRACTION_VELOCITY_UUID]["max"], 6.905701940184699)
+    assert_percent_diff(
+        [aggregate_metrics_dict[CONTRACTION_VELOCITY_UUID][stat] for stat in ("mean", "std", "min", "max")],
+        [6.440001805351568, 0.2531719477692566, 5.990590432409137, 6.905701940184699],
+    )
 
 
 def test_new_A1_relaxation_velocity(new_A1):
     per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A1)
 
     # test data_metrics per beat dictionary
-    assert_percent_diff(per_twitch_dict[105000][RELAXATION_VELOCITY_UUID], 3.8382997965182004)
-    assert_percent_diff(per_twitch_dict[186000][RELAXATION_VELOCITY_UUID], 3.7836936936936936)
-    assert_percent_diff(per_twitch_dict[266000][RELAXATION_VELOCITY_UUID], 4.144501085146116)
+    assert_percent_diff(
+        [per_twitch_dict[timepoint][RELAXATION_VELOCITY_UUID] for timepoint in (105000, 186000, 266000)],
+        [3.8382997965182004, 3.7836936936936936, 4.144501085146116],
+    )
 
     # test data_metrics aggregate dictionary
     assert aggregate_metrics_dict[RELAXATION_VELOCITY_UUID]["n"] == 11
-    assert_percent_diff(aggregate_metrics_dict[RELAXATION_VELOCITY_UUID]["mean"], 4.053570198234518)
-    assert_percent_diff(aggregate_metrics_dict[RELAXATION_VELOCITY_UUID]["std"], 0.23419699561645954)
-    assert_percent_diff(aggregate_metrics_dict[RELAXATION_VELOCITY_UUID]["min"], 3.7407880918679512)
-    assert_percent_diff(aggregate_metrics_dict[RELAXATION_VELOCITY_UUID]["max"], 4.495471014492754)
+    assert_percent_diff(
+        [aggregate_metrics_dict[RELAXATION_VELOCITY_UUID][stat] for stat in ("mean", "std", "min", "max")],
+        [4.053570198234518, 0.23419699561645954, 3.7407880918679512, 4.495471014492754],
+    )
 
 
 def test_new_A1_interval_irregularity(new_A1):
@@ -352,100 +306,57 @@ def test_new_A1_amplitude_unrounded(new_A1):
     assert per_twitch_dict[266000][AMPLITUDE_UUID] == approx(102671)
 
 
-def test_new_A2_amplitude(new_A2):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A2)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["n"] == 11
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["mean"], 95231)
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["std"], 1731)
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["min"] == 92662
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["max"] == 98873
-
-    # test data_metrics per beat dictionary
-    assert per_twitch_dict[104000][AMPLITUDE_UUID] == 93844
-    assert per_twitch_dict[185000][AMPLITUDE_UUID] == 95950
-    assert per_twitch_dict[262000][AMPLITUDE_UUID] == 98873
-
-
-def test_new_A3_amplitude(new_A3):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A3)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["n"] == 10
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["mean"], 70491)
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["std"], 2136)
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["min"] == 67811
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["max"] == 73363
-
-    # test data_metrics per beat dictionary
-    assert per_twitch_dict[108000][AMPLITUDE_UUID] == 67811
-    assert per_twitch_dict[193000][AMPLITUDE_UUID] == 73363
-    assert per_twitch_dict[266000][AMPLITUDE_UUID] == 67866
-
-
-def test_new_A4_amplitude(new_A4):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A4)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["n"] == 15
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["mean"], 130440)
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["std"], 3416)
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["min"] == 124836
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["max"] == 136096
-
-    # test data_metrics per beat dictionary
-    assert per_twitch_dict[81000][AMPLITUDE_UUID] == 131976
-    assert per_twitch_dict[137000][AMPLITUDE_UUID] == 136096
-    assert per_twitch_dict[196000][AMPLITUDE_UUID] == 129957
-
-
-def test_new_A5_amplitude(new_A5):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A5)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["n"] == 15
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["mean"], 55863)
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["std"], 1144)
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["min"] == 54291
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["max"] == 58845
-
-    # test data_metrics per beat dictionary
-    assert per_twitch_dict[80000][AMPLITUDE_UUID] == 54540
-    assert per_twitch_dict[138000][AMPLITUDE_UUID] == 54739
-    assert per_twitch_dict[197000][AMPLITUDE_UUID] == 56341
-
-
-def test_new_A6_amplitude(new_A6):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A6)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["n"] == 15
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["mean"], 10265)
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["std"], 568)
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["min"] == 9056
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["max"] == 11052
-
-    # test data_metrics per beat dictionary
-    assert per_twitch_dict[88000][AMPLITUDE_UUID] == 10761
-    assert per_twitch_dict[148000][AMPLITUDE_UUID] == 10486
-    assert per_twitch_dict[201000][AMPLITUDE_UUID] == 10348
-
-
-def test_maiden_voyage_data_amplitude(maiden_voyage_data):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(maiden_voyage_data)
+@pytest.mark.parametrize(
+    "well_fixture_name,expected_aggregate_stats,expected_per_twitch_amplitudes",
+    [
+        (
+            "new_A2",
+            (11, 95231, 1731, 92662, 98873),
+            {104000: 93844, 185000: 95950, 262000: 98873},
+        ),
+        (
+            "new_A3",
+            (10, 70491, 2136, 67811, 73363),
+            {108000: 67811, 193000: 73363, 266000: 67866},
+        ),
+        (
+            "new_A4",
+            (15, 130440, 3416, 124836, 136096),
+            {81000: 131976, 137000: 136096, 196000: 129957},
+        ),
+        (
+            "new_A5",
+            (15, 55863, 1144, 54291, 58845),
+            {80000: 54540, 138000: 54739, 197000: 56341},
+        ),
+        (
+            "new_A6",
+            (15, 10265, 568, 9056, 11052),
+            {88000: 10761, 148000: 10486, 201000: 10348},
+        ),
+        (
+            "maiden_voyage_data",
+            (10, 477098, 40338, 416896, 531133),
+            {123500: 523198, 449500: 435673, 856000: 464154},
+        ),
+    ],
+)
+def test_amplitude__matches_expected_values_of_well(
+    well_fixture_name, expected_aggregate_stats, expected_per_twitch_amplitudes, request
+):
+    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(request.getfixturevalue(well_fixture_name))
+    expected_n, expected_mean, expected_std, expected_min, expected_max = expected_aggregate_stats
 
     # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["n"] == 10
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["mean"], 477098)
-    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["std"], 40338)
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["min"] == 416896
-    assert aggregate_metrics_dict[AMPLITUDE_UUID]["max"] == 531133
+    assert aggregate_metrics_dict[AMPLITUDE_UUID]["n"] == expected_n
+    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["mean"], expected_mean)
+    assert_percent_diff(aggregate_metrics_dict[AMPLITUDE_UUID]["std"], expected_std)
+    assert aggregate_metrics_dict[AMPLITUDE_UUID]["min"] == expected_min
+    assert aggregate_metrics_dict[AMPLITUDE_UUID]["max"] == expected_max
 
     # test data_metrics per beat dictionary
-    assert per_twitch_dict[123500][AMPLITUDE_UUID] == 523198
-    assert per_twitch_dict[449500][AMPLITUDE_UUID] == 435673
-    assert per_twitch_dict[856000][AMPLITUDE_UUID] == 464154
+    for twitch_timepoint, expected_amplitude in expected_per_twitch_amplitudes.items():
+        assert per_twitch_dict[twitch_timepoint][AMPLITUDE_UUID] == expected_amplitude
 
 
 def test_new_A1_twitch_widths_unrounded(new_A1):
@@ -495,6 +406,37 @@ def test_new_A1_twitch_widths(new_A1):
     assert aggregate_metrics_dict[WIDTH_UUID][90]["max"] == 46182
 
 
+def test_calculate_twitch_widths__finds_threshold_crossing_closest_to_peak_when_rising_side_is_not_monotonic():
+    # fmt: off
+    filtered_data = np.array(
+        [
+            [0, 1000, 2000, 3000, 4000, 5000, 6000, 7000],
+            [0, 50, 40, 80, 100, 60, 20, 0],
+        ],
+        dtype=np.int32,
+    )
+    # fmt: on
+    twitch_indices = TwitchIndices(
+        peak=[4],
+        prior_peak=[-1],
+        prior_valley=[0],
+        subsequent_peak=[7],
+        subsequent_valley=[7],
+    )
+    actual = peak_detection.calculate_twitch_widths(twitch_indices, filtered_data)
+
+    assert actual[0][10][WIDTH_RISING_COORDS_UUID] == (3500, 90)
+    assert actual[0][10][WIDTH_FALLING_COORDS_UUID] == (4250, 90)
+    assert actual[0][55][WIDTH_RISING_COORDS_UUID] == (2125, 45)
+    assert actual[0][60][WIDTH_RISING_COORDS_UUID] == (2000, 40)
+    assert actual[0][65][WIDTH_RISING_COORDS_UUID] == (700, 35)
+
+
+def test_interpolate_y_for_x_between_two_points__returns_value_on_line_through_the_two_points():
+    actual = peak_detection.interpolate_y_for_x_between_two_points(3, 1, 10, 5, 30)
+    assert actual == 20
+
+
 def test_new_A2_twitch_widths(new_A2):
     pipeline, _ = new_A2
     filtered_data = pipeline.get_noise_filtered_gmr()
@@ -665,15 +607,16 @@ def test_new_A1_auc(new_A1):
 
     # test data_metrics aggregate dictionary
     assert aggregate_metrics_dict[AUC_UUID]["n"] == 11
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["mean"], 2197883129)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["std"], 40391699)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["min"], 2145365902)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["max"], 2268446950)
+    assert_percent_diff(
+        [aggregate_metrics_dict[AUC_UUID][stat] for stat in ("mean", "std", "min", "max")],
+        [2197883129, 40391699, 2145365902, 2268446950],
+    )
 
     # test data_metrics per beat dictionary
-    assert_percent_diff(per_twitch_dict[105000][AUC_UUID], 2268446950)
-    assert_percent_diff(per_twitch_dict[186000][AUC_UUID], 2203146703)
-    assert_percent_diff(per_twitch_dict[266000][AUC_UUID], 2187484903)
+    assert_percent_diff(
+        [per_twitch_dict[timepoint][AUC_UUID] for timepoint in (105000, 186000, 266000)],
+        [2268446950, 2203146703, 2187484903],
+    )
 
 
 def test_new_A1_auc_unrounded(new_A1):
@@ -692,109 +635,63 @@ def test_new_A1_auc_unrounded(new_A1):
     assert per_twitch_dict[266000][AUC_UUID] == approx(2187480306.2996)
 
 
-def test_new_A2_auc(new_A2):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A2)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AUC_UUID]["n"] == 11
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["mean"], 1979655695)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["std"], 60891061)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["min"], 1880100989)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["max"], 2098455889)
-
-    # test data_metrics per beat dictionary
-    assert_percent_diff(per_twitch_dict[104000][AUC_UUID], 1890483550)
-    assert_percent_diff(per_twitch_dict[185000][AUC_UUID], 1995261562)
-    assert_percent_diff(per_twitch_dict[262000][AUC_UUID], 2098455889)
-
-
-def test_new_A3_auc(new_A3):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A3)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AUC_UUID]["n"] == 10
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["mean"], 1742767961)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["std"], 26476362)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["min"], 1700775183)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["max"], 1785602477)
-
-    # test data_metrics per beat dictionary
-    assert_percent_diff(per_twitch_dict[108000][AUC_UUID], 1743723350)
-    assert_percent_diff(per_twitch_dict[193000][AUC_UUID], 1719164790)
-    assert_percent_diff(per_twitch_dict[266000][AUC_UUID], 1711830854)
-
-
-def test_new_A4_auc(new_A4):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A4)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AUC_UUID]["n"] == 15
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["mean"], 2337802567)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["std"], 85977760)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["min"], 2204456864)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["max"], 2474957390)
-
-    # test data_metrics per beat dictionary
-    assert_percent_diff(per_twitch_dict[81000][AUC_UUID], 2369406142)
-    assert_percent_diff(per_twitch_dict[137000][AUC_UUID], 2474957390)
-    assert_percent_diff(per_twitch_dict[196000][AUC_UUID], 2305482514)
-
-
-def test_new_A5_auc(new_A5):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A5)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AUC_UUID]["n"] == 15
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["mean"], 975669720)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["std"], 39452029)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["min"], 916556595)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["max"], 1079880664)
-
-    # test data_metrics per beat dictionary
-    assert_percent_diff(per_twitch_dict[80000][AUC_UUID], 962568392)
-    assert_percent_diff(per_twitch_dict[138000][AUC_UUID], 978169492)
-    assert_percent_diff(per_twitch_dict[197000][AUC_UUID], 989808351)
-
-
-def test_new_A6_auc(new_A6):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(new_A6)
-
-    # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AUC_UUID]["n"] == 15
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["mean"], 225373714)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["std"], 24559045)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["min"], 180116348)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["max"], 265573223)
-
-    # test data_metrics per beat dictionary
-    assert_percent_diff(per_twitch_dict[88000][AUC_UUID], 256551364)
-    assert_percent_diff(per_twitch_dict[148000][AUC_UUID], 257671482)
-    assert_percent_diff(per_twitch_dict[201000][AUC_UUID], 201413091)
-
-
-def test_maiden_voyage_data_auc(maiden_voyage_data):
-    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(maiden_voyage_data)
+@pytest.mark.parametrize(
+    "well_fixture_name,expected_aggregate_stats,expected_per_twitch_aucs",
+    [
+        (
+            "new_A2",
+            (11, 1979655695, 60891061, 1880100989, 2098455889),
+            {104000: 1890483550, 185000: 1995261562, 262000: 2098455889},
+        ),
+        (
+            "new_A3",
+            (10, 1742767961, 26476362, 1700775183, 1785602477),
+            {108000: 1743723350, 193000: 1719164790, 266000: 1711830854},
+        ),
+        (
+            "new_A4",
+            (15, 2337802567, 85977760, 2204456864, 2474957390),
+            {81000: 2369406142, 137000: 2474957390, 196000: 2305482514},
+        ),
+        (
+            "new_A5",
+            (15, 975669720, 39452029, 916556595, 1079880664),
+            {80000: 962568392, 138000: 978169492, 197000: 989808351},
+        ),
+        (
+            "new_A6",
+            (15, 225373714, 24559045, 180116348, 265573223),
+            {88000: 256551364, 148000: 257671482, 201000: 201413091},
+        ),
+        (
+            "maiden_voyage_data",
+            (10, 9802421961, 1211963395, 8147044761, 11738292588),
+            {123500: 10975158070, 449500: 8678984942, 856000: 8919661597},
+        ),
+    ],
+)
+def test_auc__matches_expected_values_of_well(
+    well_fixture_name, expected_aggregate_stats, expected_per_twitch_aucs, request
+):
+    per_twitch_dict, aggregate_metrics_dict = _get_data_metrics(request.getfixturevalue(well_fixture_name))
+    expected_n, *expected_stats = expected_aggregate_stats
 
     # test data_metrics aggregate dictionary
-    assert aggregate_metrics_dict[AUC_UUID]["n"] == 10
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["mean"], 9802421961)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["std"], 1211963395)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["min"], 8147044761)
-    assert_percent_diff(aggregate_metrics_dict[AUC_UUID]["max"], 11738292588)
+    assert aggregate_metrics_dict[AUC_UUID]["n"] == expected_n
+    assert_percent_diff(
+        [aggregate_metrics_dict[AUC_UUID][stat] for stat in ("mean", "std", "min", "max")],
+        expected_stats,
+    )
 
     # test data_metrics per beat dictionary
-    assert_percent_diff(per_twitch_dict[123500][AUC_UUID], 10975158070)
-    assert_percent_diff(per_twitch_dict[449500][AUC_UUID], 8678984942)
-    assert_percent_diff(per_twitch_dict[856000][AUC_UUID], 8919661597)
-
-
-def test_peak_detector_does_not_flip_data_by_default__because_default_kwarg_is_true():
+    assert_percent_diff(
+        [per_twitch_dict[twitch_timepoint][AUC_UUID] for twitch_timepoint in expected_per_twitch_aucs],
+        list(expected_per_twitch_aucs.values()),
+    )
 
-    time, v = _load_file_tsv(os.path.join(PATH_TO_DATASETS, "new_A1_tsv.tsv"))
 
-    # create numpy matrix
-    raw_data = create_numpy_array_of_raw_gmr_from_python_arrays(time, v)
-    peak_and_valley_indices = peak_detector(raw_data)
+def test_peak_detector_does_not_flip_data_by_default__because_default_kwarg_is_true(raw_generic_well_a1):
+    peak_and_valley_indices = peak_detector(raw_generic_well_a1)
     peak_indices, valley_indices = peak_and_valley_indices
 
     expected_peak_indices = [70, 147, 220, 305, 397, 463, 555, 628, 713, 779, 871, 963]
@@ -998,6 +895,18 @@ def test_maiden_voyage_data_peak_detection(maiden_voyage_data):
     assert np.array_equal(valley_indices, expected_valley_indices)
 
 
+def test_remove_duplicate_valleys__keeps_the_highest_valley_of_each_set_of_valleys_with_identical_intersection_points():
+    magnetic_signal = np.array([0, 5, 0, 3, 4, 0, 7, 7, 0, 2], dtype=np.int32)
+    valley_indices = np.array([1, 3, 4, 6, 7, 9])
+    left_ips = np.array([0.5, 2.5, 2.5, 5.5, 5.5, 8.5])
+    right_ips = np.array([1.5, 4.5, 4.5, 7.5, 7.5, 9.5])
+
+    actual = peak_detection._remove_duplicate_valleys(  # pylint:disable=protected-access
+        valley_indices, left_ips, right_ips, magnetic_signal
+    )
+    np.testing.assert_array_equal(actual, [1, 4, 6, 9])
+
+
 def test_find_twitch_indices__raises_error_if_less_than_3_peaks_given():
     with pytest.raises(
         TooFewPeaksDetectedError,
@@ -1214,6 +1123,49 @@ def test_find_twitch_indices__returns_correct_values_with_data_that_ends_in_vall
     assert actual[3][SUBSEQUENT_VALLEY_INDEX_UUID] == 4
 
 
+def test_find_twitch_index_arrays__returns_parallel_arrays_with_negative_prior_peak_for_first_twitch_without_one():
+    peak_indices = np.array([1, 3, 5], dtype=np.int32)
+    valley_indices = np.array([0, 2, 4], dtype=np.int32)
+    actual = find_twitch_index_arrays((peak_indices, valley_indices))
+
+    assert len(actual) == 2
+    np.testing.assert_array_equal(actual.peak, [1, 3])
+    np.testing.assert_array_equal(actual.prior_peak, [-1, 1])
+    np.testing.assert_array_equal(actual.prior_valley, [0, 2])
+    np.testing.assert_array_equal(actual.subsequent_peak, [3, 5])
+    np.testing.assert_array_equal(actual.subsequent_valley, [2, 4])
+
+
+def test_calculate_functions__accept_the_dictionary_returned_by_find_twitch_indices(new_A1):
+    pipeline, peak_and_valley_indices = new_A1
+    filtered_data = pipeline.get_noise_filtered_gmr()
+    peak_indices, _ = peak_and_valley_indices
+    twitch_index_arrays = find_twitch_index_arrays(peak_and_valley_indices)
+    twitch_index_dict = find_twitch_indices(peak_and_valley_indices)
+    widths = peak_detection.calculate_twitch_widths(twitch_index_arrays, filtered_data)
+
+    assert peak_detection.calculate_twitch_widths(twitch_index_dict, filtered_data) == widths
+    for calculate, args in (
+        (peak_detection.calculate_amplitudes, (filtered_data,)),
+        (peak_detection.calculate_area_under_curve, (filtered_data, widths)),
+        (peak_detection.calculate_twitch_period, (peak_indices, filtered_data)),
+        (peak_detection.calculate_twitch_velocity, (widths, True)),
+        (peak_detection.calculate_interval_irregularity, (filtered_data[0, :],)),
+    ):
+        np.testing.assert_array_equal(
+            calculate(twitch_index_dict, *args), calculate(twitch_index_arrays, *args)
+        )
+
+
+def test_TwitchIndices__compares_by_identity_instead_of_comparing_arrays():
+    peak_indices = np.array([1, 3, 5], dtype=np.int32)
+    valley_indices = np.array([0, 2, 4], dtype=np.int32)
+    twitch_indices = find_twitch_index_arrays((peak_indices, valley_indices))
+    identical_twitch_indices = find_twitch_index_arrays((peak_indices, valley_indices))
+
+    assert (twitch_indices == identical_twitch_indices) is False
+
+
 def test_noisy_data_A1(noisy_data_A1):
     pipeline, peak_and_valley_indices = noisy_data_A1
 